@@ -0,0 +1,147 @@
+import numpy as np
+from manimlib.animation.animation import Animation
+from manimlib.animation.composition import AnimationGroup
+from manimlib.animation.transform import Transform, TransformFromCopy
+from manimlib.mobject.mobject import Mobject
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.utils.paths import straight_path
+from manimlib.utils.simple_functions import clip
+
+class AnimationTrack:
+    # every straight transform of a play is flattened into one start and one
+    # target buffer, the mobjects it moves get views into a third one, so a
+    # frame is a single interpolation instead of one per submobject
+    def __init__(self, animations):
+        self.leaves = []
+        self.unbaked = []
+        starts = []
+        targets = []
+        sizes = []
+        self.views = []
+        self.triangulated = []
+        for animation in animations:
+            run_time = animation.run_time
+            self.add_animation(animation, lambda t, run_time=run_time: t / run_time, starts, targets, sizes)
+        self.segment_alphas = np.zeros(len(sizes))
+        if not starts:
+            self.values = None
+            return
+        self.starts = np.concatenate(starts)
+        self.targets = np.concatenate(targets)
+        self.values = self.starts.copy()
+        self.segments = np.repeat(np.arange(len(sizes)), sizes)
+        offset = 0
+        for submob, key, shape in self.views:
+            size = int(np.prod(shape))
+            submob.data[key] = self.values[offset:offset + size].reshape(shape)
+            offset += size
+        self.views = None
+
+    def add_animation(self, animation, get_alpha, starts, targets, sizes):
+        if type(animation).interpolate is AnimationGroup.interpolate:
+            for child, start_time, end_time in animation.anims_with_timings:
+                self.add_animation(
+                    child, self.get_child_alpha(animation, start_time, end_time, get_alpha),
+                    starts, targets, sizes,
+                )
+        elif self.can_bake(animation):
+            first_segment = len(sizes)
+            for submob, start, target in animation.families:
+                family_starts, family_targets, shapes = self.get_family_arrays(submob, start, target)
+                starts.extend(family_starts)
+                targets.extend(family_targets)
+                sizes.append(sum(array.size for array in family_starts))
+                self.views.extend((submob, key, shape) for key, shape in shapes)
+                if isinstance(submob, VMobject) and self.triangulation_changes(start, target):
+                    self.triangulated.append(submob)
+            self.leaves.append((animation, get_alpha, first_segment, len(sizes)))
+        else:
+            self.unbaked.append((animation, get_alpha))
+
+    def get_child_alpha(self, group, start_time, end_time, get_alpha):
+        anim_time = end_time - start_time
+        def get_child_alpha(t):
+            if anim_time == 0:
+                return 0
+            return clip((get_alpha(t) * group.max_end_time - start_time) / anim_time, 0, 1)
+        return get_child_alpha
+
+    def can_bake(self, animation):
+        return all([
+            isinstance(animation, Transform),
+            type(animation).interpolate in (Animation.interpolate, TransformFromCopy.interpolate),
+            type(animation).interpolate_mobject is Animation.interpolate_mobject,
+            type(animation).interpolate_submobject is Transform.interpolate_submobject,
+            animation.path_func is straight_path,
+            not animation.mobject.get_family_updaters(),
+            all(self.can_bake_family(*family) for family in animation.families),
+        ])
+
+    def can_bake_family(self, submob, start, target):
+        if type(submob).interpolate not in (Mobject.interpolate, VMobject.interpolate):
+            return False
+        # uniforms are interpolated too, only constant ones are left alone
+        if any(not np.all(start.uniforms[key] == target.uniforms[key]) for key in submob.uniforms):
+            return False
+        for key in self.get_interpolated_keys(submob, start, target):
+            arrays = [submob.data[key], start.data[key], target.data[key]]
+            if any(array.dtype != np.float64 or array.shape != arrays[0].shape for array in arrays):
+                return False
+        return True
+
+    def get_interpolated_keys(self, submob, start, target):
+        return [
+            key for key in submob.data
+            if key not in submob.locked_data_keys
+            and len(submob.data[key]) > 0
+            and key in start.data and key in target.data
+        ]
+
+    def get_family_arrays(self, submob, start, target):
+        keys = self.get_interpolated_keys(submob, start, target)
+        return (
+            [start.data[key].ravel() for key in keys],
+            [target.data[key].ravel() for key in keys],
+            [(key, submob.data[key].shape) for key in keys],
+        )
+
+    def triangulation_changes(self, start, target):
+        start_triangulation = start.get_triangulation()
+        target_triangulation = target.get_triangulation()
+        return len(start_triangulation) != len(target_triangulation) or not np.all(start_triangulation == target_triangulation)
+
+    def get_leaf_alphas(self, animation, alpha, num_families):
+        if type(animation).interpolate is TransformFromCopy.interpolate:
+            alpha = 1 - alpha
+        # Animation.get_sub_alpha for all families at once, the lag is taken
+        # on the raw alpha and each family eases through its own window
+        lag_ratio = animation.lag_ratio
+        full_length = (num_families - 1) * lag_ratio + 1
+        if lag_ratio == 0:
+            # every family shares one alpha, rate_func is called once
+            return np.full(num_families, animation.rate_func(clip(alpha, 0, 1)))
+        sub_alphas = np.clip(clip(alpha, 0, 1) * full_length - np.arange(num_families) * lag_ratio, 0, 1)
+        try:
+            alphas = np.asarray(animation.rate_func(sub_alphas), dtype=float)
+        except (TypeError, ValueError):
+            alphas = None
+        if alphas is None or alphas.shape != sub_alphas.shape:
+            # a rate_func that only takes scalars, one call per family
+            alphas = np.array([animation.rate_func(sub_alpha) for sub_alpha in sub_alphas])
+        return alphas
+
+    def interpolate(self, t):
+        for animation, get_alpha in self.unbaked:
+            animation.interpolate(get_alpha(t))
+        if self.values is None:
+            return
+        for animation, get_alpha, first_segment, end_segment in self.leaves:
+            self.segment_alphas[first_segment:end_segment] = self.get_leaf_alphas(
+                animation, get_alpha(t), end_segment - first_segment
+            )
+        alphas = self.segment_alphas[self.segments]
+        np.multiply(1 - alphas, self.starts, out=self.values)
+        self.values += alphas * self.targets
+        for submob in self.triangulated:
+            if submob.has_fill():
+                submob.refresh_triangulation()
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import subprocess as sp
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+from manimlib.config import get_custom_config, get_module
+from manimlib.logger import log
+
+from render import get_quality_tiers, get_scene_classes
+
+# baselines are machine specific and not checked in, the first
+# python benchmark.py --save on a machine creates this one
+DEFAULT_BASELINE = os.path.join('benchmarks', 'baseline.json')
+TRIANGLE_SIZES = [4, 8, 16, 32]
+CHOICE_SIZES = [(4, 2), (5, 2), (6, 3), (8, 3), (10, 4)]
+
+def parse_cli():
+    parser = argparse.ArgumentParser(description='Benchmark the triangle scenes and helpers')
+    parser.add_argument('file', nargs='?', default='video.py')
+    parser.add_argument('--scenes', nargs='*', help='Only run these scenes')
+    parser.add_argument('--qualities', nargs='*', help='Only run these camera_qualities tiers')
+    parser.add_argument('--micro-only', action='store_true', help='Skip the scene renders')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per micro benchmark, the best one is kept')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='Store the results as the new baseline, creating it if needed')
+    parser.add_argument('--check', action='store_true', help='Fail when a result is slower than the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative slowdown for --check')
+    return parser.parse_args()
+
+def write_benchmark_config(directory):
+    # every scene is rendered cold, without the partial movie cache and
+    # into a scratch output directory
+    config = get_custom_config()
+    config['break_into_partial_movies'] = False
+    config['directories']['output'] = directory
+    config['directories']['temporary_storage'] = os.path.join(directory, 'temp')
+    config_file = os.path.join(directory, 'custom_config.yml')
+    with open(config_file, 'w') as fp:
+        yaml.safe_dump(config, fp)
+    return config_file
+
+def count_frames(movie_file):
+    if not os.path.exists(movie_file):
+        return 0
+    result = sp.run([
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-count_packets',
+        '-show_entries', 'stream=nb_read_packets',
+        '-of', 'csv=p=0',
+        movie_file,
+    ], capture_output=True, text=True, check=True)
+    return int(result.stdout.strip() or 0)
+
+def benchmark_scene(file, scene_name, tier, directory, config_file):
+    camera_quality = get_custom_config()['camera_qualities'][tier]
+    output_directory = os.path.join(directory, tier)
+    start = time.perf_counter()
+    process = sp.Popen([
+        sys.executable, '-m', 'manimlib', file, scene_name,
+        '-w', '--quiet',
+        '-r', camera_quality['resolution'],
+        '--frame_rate', str(camera_quality['frame_rate']),
+        '--video_dir', output_directory,
+        '--config_file', config_file,
+    ])
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall_seconds = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f'{scene_name} failed to render at {tier}')
+    frames = count_frames(os.path.join(output_directory, 'videos', scene_name + '.mp4'))
+    return {
+        'wall_seconds': wall_seconds,
+        'frames': frames,
+        'frames_per_second': frames / wall_seconds,
+        'video_seconds_per_second': frames / camera_quality['frame_rate'] / wall_seconds,
+        'peak_rss_megabytes': rusage.ru_maxrss / 1024,
+    }
+
+def benchmark_function(function, repeat):
+    best_seconds = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+    # tracing slows everything down, so memory gets its own run
+    tracemalloc.start()
+    function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'wall_seconds': best_seconds,
+        'peak_python_megabytes': peak_bytes / (1024 * 1024),
+    }
+
+def consume(iterator):
+    for _ in iterator:
+        pass
+
+def run_micro_benchmarks(module, repeat):
+    results = {}
+    for size in TRIANGLE_SIZES:
+        log.info(f'Benchmarking PascalTriangle.generate({size})')
+        results[f'PascalTriangle.generate({size})'] = benchmark_function(
+            lambda: module.PascalTriangle().generate(size), repeat
+        )
+    for n, k in CHOICE_SIZES:
+        log.info(f'Benchmarking find_choices({n}, {k})')
+        options = module.VGroup(*(module.RegularPolygon(3 + i) for i in range(n)))
+        results[f'find_choices({n}, {k})'] = benchmark_function(
+            lambda: module.find_choices(options, k), repeat
+        )
+        # the streamed variant, up to the first chunk and through every chunk
+        results[f'iter_choice_chunks({n}, {k}) first chunk'] = benchmark_function(
+            lambda: next(module.iter_choice_chunks(options, k)), repeat
+        )
+        results[f'iter_choice_chunks({n}, {k})'] = benchmark_function(
+            lambda: consume(module.iter_choice_chunks(options, k)), repeat
+        )
+    return results
+
+def run_scene_benchmarks(file, scene_names, tiers):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        config_file = write_benchmark_config(directory)
+        for tier in tiers:
+            for scene_name in scene_names:
+                log.info(f'Benchmarking {scene_name} at {tier}')
+                results[f'{scene_name}@{tier}'] = benchmark_scene(file, scene_name, tier, directory, config_file)
+    return results
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        baseline_seconds = baseline[name]['wall_seconds']
+        if result['wall_seconds'] > baseline_seconds * (1 + tolerance):
+            regressions.append(f"{name}: {result['wall_seconds']:.3f}s against {baseline_seconds:.3f}s")
+    return regressions
+
+def main():
+    args = parse_cli()
+    if args.check and not os.path.exists(args.baseline):
+        # fail before the benchmarks run, not after
+        log.error(f'No baseline at {args.baseline}, create one with --save')
+        sys.exit(1)
+    module = get_module(args.file)
+    results = run_micro_benchmarks(module, args.repeat)
+    if not args.micro_only:
+        scene_names = [scene_class.__name__ for scene_class in get_scene_classes(module)]
+        if args.scenes:
+            scene_names = [scene_name for scene_name in scene_names if scene_name in args.scenes]
+        tiers = [tier for tier in get_quality_tiers() if not args.qualities or tier in args.qualities]
+        results.update(run_scene_benchmarks(args.file, scene_names, tiers))
+    print(json.dumps(results, indent=2))
+    if args.check:
+        with open(args.baseline) as fp:
+            regressions = find_regressions(results, json.load(fp), args.tolerance)
+        for regression in regressions:
+            log.error(f'Regression in {regression}')
+        if regressions:
+            sys.exit(1)
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fp:
+                baseline = json.load(fp)
+        baseline.update(results)
+        with open(args.baseline, 'w') as fp:
+            json.dump(baseline, fp, indent=2, sort_keys=True)
+        log.info(f'Baseline saved to {args.baseline}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+import functools
+
+import numpy as np
+
+class BinomialRows:
+    # memoized rows of the triangle, row n + 1 is built from row n with
+    # C(n + 1, k) = C(n, k - 1) + C(n, k) so every value stays an exact int
+    def __init__(self):
+        self.rows = [(1,)]
+
+    def row(self, n):
+        while len(self.rows) <= n:
+            last_row = self.rows[-1]
+            self.rows.append((1, *(a + b for a, b in zip(last_row, last_row[1:])), 1))
+        return self.rows[n]
+
+    def __getitem__(self, n):
+        return self.row(n)
+
+BINOMIAL_ROWS = BinomialRows()
+# C(66, 33) is the last central value that fits in an int64
+INT64_BINOMIAL_ROWS = 67
+# primes up to this get factorial tables, 1MB for the pair at most, and
+# every product of two table values stays far below 2 ** 63
+FACTORIAL_TABLE_LIMIT = 1 << 16
+# bases that decide primality exactly for every p below 3.3 * 10 ** 24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+@functools.lru_cache(maxsize=4096)
+def binomial(n, k):
+    if k < 0 or k > n:
+        return 0
+    if n < len(BINOMIAL_ROWS.rows):
+        return BINOMIAL_ROWS.rows[n][k]
+    k = min(k, n - k)
+    value = 1
+    for i in range(1, k + 1):
+        value = value * (n - k + i) // i
+    return value
+
+def row_sum(n):
+    return 1 << n
+
+def hockey_stick_sum(n, k):
+    # C(k, k) + C(k + 1, k) + ... + C(n, k)
+    return binomial(n + 1, k + 1)
+
+def is_prime(p):
+    if p < 2:
+        return False
+    for base in MILLER_RABIN_BASES:
+        if p % base == 0:
+            return p == base
+    d, s = p - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, d, p)
+        if x in (1, p - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % p
+            if x == p - 1:
+                break
+        else:
+            return False
+    return True
+
+@functools.lru_cache(maxsize=8)
+def factorial_tables(p):
+    factorials = np.ones(p, dtype=np.int64)
+    for i in range(1, p):
+        factorials[i] = factorials[i - 1] * i % p
+    inverse_factorials = np.ones(p, dtype=np.int64)
+    inverse_factorials[p - 1] = pow(int(factorials[p - 1]), p - 2, p)
+    for i in range(p - 1, 0, -1):
+        inverse_factorials[i - 1] = inverse_factorials[i] * i % p
+    return factorials, inverse_factorials
+
+def digit_binomial_mod(n, k, p):
+    # C(n, k) mod p for a single base p digit, n < p
+    if p <= FACTORIAL_TABLE_LIMIT:
+        factorials, inverse_factorials = factorial_tables(p)
+        return int(factorials[n]) * int(inverse_factorials[k]) * int(inverse_factorials[n - k]) % p
+    # too large to tabulate, only the min(k, n - k) factors are multiplied
+    k = min(k, n - k)
+    numerator = denominator = 1
+    for i in range(1, k + 1):
+        numerator = numerator * (n - k + i) % p
+        denominator = denominator * i % p
+    return numerator * pow(denominator, -1, p) % p
+
+def binomial_mod(n, k, p):
+    if k < 0 or k > n:
+        return 0
+    if not is_prime(p):
+        return binomial(n, k) % p
+    # Lucas: C(n, k) is the product of C(n_i, k_i) over the base p digits
+    value = 1
+    while n or k:
+        n_digit, k_digit = n % p, k % p
+        if k_digit > n_digit:
+            return 0
+        value = value * digit_binomial_mod(n_digit, k_digit, p) % p
+        n //= p
+        k //= p
+    return value
+
+@functools.lru_cache(maxsize=1)
+def int64_binomial_table():
+    table = np.zeros((INT64_BINOMIAL_ROWS, INT64_BINOMIAL_ROWS), dtype=np.int64)
+    for n in range(INT64_BINOMIAL_ROWS):
+        table[n, :n + 1] = BINOMIAL_ROWS.row(n)
+    return table
+
+def binomial_batch(pairs, modulus=None):
+    # pairs is an (N, 2) array of (n, k), answered in one vectorized call
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if len(pairs) == 0:
+        return np.zeros(0, dtype=np.int64)
+    n, k = pairs[:, 0], pairs[:, 1]
+    outside = (k < 0) | (k > n)
+    if modulus is not None and modulus <= FACTORIAL_TABLE_LIMIT and is_prime(modulus):
+        factorials, inverse_factorials = factorial_tables(modulus)
+        values = np.ones(len(pairs), dtype=np.int64)
+        n, k = np.where(outside, 0, n), np.where(outside, 0, k)
+        while np.any(n):
+            n_digits, k_digits = n % modulus, k % modulus
+            outside |= k_digits > n_digits
+            n_digits = np.maximum(n_digits, k_digits)
+            values = values * factorials[n_digits] % modulus
+            values = values * inverse_factorials[k_digits] % modulus
+            values = values * inverse_factorials[n_digits - k_digits] % modulus
+            n, k = n // modulus, k // modulus
+        return np.where(outside, 0, values)
+    if modulus is None and n.max() < INT64_BINOMIAL_ROWS:
+        rows = np.maximum(n, 0)
+        return np.where(outside, 0, int64_binomial_table()[rows, np.clip(k, 0, rows)])
+    # exact python ints, a large modulus would overflow int64 products
+    if modulus is None:
+        return np.frompyfunc(binomial, 2, 1)(n.tolist(), k.tolist())
+    return np.frompyfunc(lambda n, k: binomial_mod(n, k, modulus), 2, 1)(n.tolist(), k.tolist())
@@ -0,0 +1,118 @@
+import os
+import queue
+import tempfile
+import threading
+
+import numpy as np
+import OpenGL.GL as gl
+
+class FramePool:
+    # every frame buffer is allocated up front and reused, in memory or in a
+    # memory mapped ring file, a frame goes back to the pool once each stream
+    # it was queued on wrote it
+    def __init__(self, frame_size, frames, ring_directory=None):
+        self.ring_file = None
+        if ring_directory is not None:
+            os.makedirs(ring_directory, exist_ok=True)
+            fd, self.ring_file = tempfile.mkstemp(dir=ring_directory, suffix='.rgba')
+            os.close(fd)
+            self.frames = np.memmap(self.ring_file, dtype=np.uint8, mode='w+', shape=(frames, frame_size))
+        else:
+            self.frames = np.empty((frames, frame_size), dtype=np.uint8)
+        self.references = [0] * frames
+        self.lock = threading.Lock()
+        self.error = None
+        self.free = queue.Queue()
+        for index in range(frames):
+            self.free.put(index)
+
+    def acquire(self):
+        # blocks while every buffer is still queued, which is what holds the
+        # renderer back when the encoders fall behind, a failed pipeline
+        # wakes it up with None instead of a buffer
+        index = self.free.get()
+        if index is None or self.error is not None:
+            self.free.put(None)
+            raise self.error
+        self.references[index] = 1
+        return index
+
+    def retain(self, index, count=1):
+        with self.lock:
+            self.references[index] += count
+
+    def release(self, index):
+        with self.lock:
+            self.references[index] -= 1
+            if self.references[index] > 0:
+                return
+        self.free.put(index)
+
+    def fail(self, error):
+        self.error = error
+        self.free.put(None)
+
+    def get_depth(self):
+        return len(self.references) - self.free.qsize()
+
+    def close(self):
+        self.frames = None
+        if self.ring_file is not None:
+            os.remove(self.ring_file)
+            self.ring_file = None
+
+class FramePipeline:
+    # a thread per output stream pipes frames to its encoder, so the scene
+    # keeps rasterizing while ffmpeg reads
+    def __init__(self, pool, streams):
+        self.pool = pool
+        self.streams = []
+        self.threads = []
+        self.error = None
+        self.frame_index = 0
+        for stdin, frame_step in streams:
+            frames = queue.Queue()
+            thread = threading.Thread(target=self.write_frames, args=(stdin, frames), daemon=True)
+            thread.start()
+            self.streams.append((frames, frame_step))
+            self.threads.append(thread)
+
+    def write_frames(self, stdin, frames):
+        while True:
+            index = frames.get()
+            if index is None:
+                return
+            try:
+                if self.error is None:
+                    stdin.write(self.pool.frames[index])
+            except Exception as error:
+                if self.error is None:
+                    self.error = error
+                    self.pool.fail(error)
+            finally:
+                self.pool.release(index)
+
+    def submit(self, index):
+        if self.error is not None:
+            raise self.error
+        streams = [frames for frames, frame_step in self.streams if self.frame_index % frame_step == 0]
+        self.pool.retain(index, len(streams))
+        for frames in streams:
+            frames.put(index)
+        self.frame_index += 1
+
+    def close(self):
+        for frames, _ in self.streams:
+            frames.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.error is not None:
+            raise self.error
+
+def read_frame_into(camera, frame):
+    # Camera.get_raw_fbo_data, into a buffer that already exists
+    pw, ph = (camera.pixel_width, camera.pixel_height)
+    gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, camera.fbo_msaa.glo)
+    gl.glBindFramebuffer(gl.GL_DRAW_FRAMEBUFFER, camera.fbo.glo)
+    gl.glBlitFramebuffer(0, 0, pw, ph, 0, 0, pw, ph, gl.GL_COLOR_BUFFER_BIT, gl.GL_LINEAR)
+    camera.fbo.read_into(frame, viewport=camera.fbo.viewport, components=camera.n_channels)
@@ -0,0 +1,157 @@
+import functools
+from contextlib import contextmanager
+
+from manimlib.constants import LEFT, RIGHT
+from manimlib.mobject.svg.tex_mobject import Tex
+from manimlib.mobject.types.vectorized_mobject import VGroup, VMobject
+
+import tex_cache
+from profiler import profiled
+
+# the trailing 0 gives the advance width, tex digits all share one advance
+# and have no kerning pairs between them
+ATLAS_DIGITS = '01234567890'
+
+# small arrays manimlib writes into through its own getters, so every copy
+# keeps a private one
+UNSHARED_KEYS = ('bounding_box', 'unit_normal')
+
+class CopyOnWriteData(dict):
+    # shared arrays are read only, a write in manimlib either replaces the
+    # entry or starts from data[key], which makes a private copy, except
+    # while a glyph is only reading its own data
+    def __init__(self, arrays=(), shared_keys=()):
+        super().__init__(arrays)
+        self.shared_keys = set(shared_keys)
+        self.readers = 0
+
+    def __getitem__(self, key):
+        if key in self.shared_keys and not self.readers:
+            self.shared_keys.discard(key)
+            dict.__setitem__(self, key, dict.__getitem__(self, key).copy())
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self.shared_keys.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def peek(self, key):
+        return dict.__getitem__(self, key)
+
+    @contextmanager
+    def reading(self):
+        self.readers += 1
+        try:
+            yield
+        finally:
+            self.readers -= 1
+
+    def share(self):
+        shared_keys = set(self) - set(UNSHARED_KEYS)
+        for key in shared_keys:
+            self.peek(key).setflags(write=False)
+        self.shared_keys = shared_keys
+        twin = CopyOnWriteData(self, shared_keys)
+        for key in UNSHARED_KEYS:
+            if key in twin:
+                dict.__setitem__(twin, key, self.peek(key).copy())
+        return twin
+
+def reads_data(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # a mobject still being built has plain data
+        if not isinstance(self.data, CopyOnWriteData):
+            return method(self, *args, **kwargs)
+        with self.data.reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class CopyOnWriteMobject:
+    # copies share one geometry buffer until one of them is actually changed
+    def copy(self):
+        data = self.data
+        self.data = {}
+        copy_mobject = super().copy()
+        self.data = data
+        copy_mobject.data = data.share()
+        return copy_mobject
+
+    def get_num_points(self):
+        return len(dict.__getitem__(self.data, 'points'))
+
+    # measuring and rendering a copy only reads its data, get_points itself
+    # stays copying since a parent shifting its family writes through it
+    compute_bounding_box = reads_data(VMobject.compute_bounding_box)
+    get_triangulation = reads_data(VMobject.get_triangulation)
+    get_fill_shader_data = reads_data(VMobject.get_fill_shader_data)
+    get_stroke_shader_data = reads_data(VMobject.get_stroke_shader_data)
+    get_fill_colors = reads_data(VMobject.get_fill_colors)
+    get_fill_opacities = reads_data(VMobject.get_fill_opacities)
+    get_stroke_colors = reads_data(VMobject.get_stroke_colors)
+    get_stroke_opacities = reads_data(VMobject.get_stroke_opacities)
+    get_stroke_widths = reads_data(VMobject.get_stroke_widths)
+
+@functools.lru_cache(maxsize=None)
+def copy_on_write_class(mobject_class):
+    return type(mobject_class.__name__, (CopyOnWriteMobject, mobject_class), {})
+
+def share_geometry(mobject):
+    # turns every VMobject of the family into a copy on write one, so the
+    # copies made from it afterwards share their arrays with it
+    for submob in mobject.get_family():
+        if isinstance(submob, VMobject) and not isinstance(submob, CopyOnWriteMobject):
+            submob.__class__ = copy_on_write_class(type(submob))
+            submob.data = CopyOnWriteData(submob.data)
+    return mobject
+
+class NumeralGlyph(CopyOnWriteMobject, VMobject):
+    def __init__(self, glyph):
+        super().__init__()
+        self.become(glyph)
+        self.data = CopyOnWriteData(self.data)
+
+class DigitAtlas:
+    @profiled('mobjects')
+    def __init__(self, **tex_config):
+        glyphs = Tex(ATLAS_DIGITS, **tex_config).family_members_with_points()
+        assert len(glyphs) == len(ATLAS_DIGITS)
+        self.advance = (glyphs[10].get_left()[0] - glyphs[0].get_left()[0]) / 10
+        # every glyph is moved back to the first slot, keeping its baseline
+        # and its side bearing inside the slot
+        self.glyphs = [NumeralGlyph(glyph.copy().shift(LEFT * digit * self.advance)) for digit, glyph in enumerate(glyphs[:10])]
+        self.numerals = {}
+        self.draft = tex_cache.DRAFT
+
+    def numeral(self, value, color=None, scale=1):
+        text = str(value)
+        if not text.isdigit():
+            numeral = Tex(text)
+            if color is not None:
+                numeral.set_color(color)
+            return numeral.scale(scale)
+        # styled and scaled numerals are cached too, so a whole triangle of
+        # them only owns its positions
+        key = (text, color, scale)
+        if key not in self.numerals:
+            if color is None and scale == 1:
+                numeral = VGroup(*(
+                    self.glyphs[int(digit)].copy().shift(RIGHT * slot * self.advance)
+                    for slot, digit in enumerate(text)
+                ))
+                numeral.center()
+            else:
+                numeral = self.numeral(text)
+                if color is not None:
+                    numeral.set_color(color)
+                numeral.scale(scale)
+            self.numerals[key] = numeral
+        return self.numerals[key].copy()
+
+DIGIT_ATLAS = None
+
+def numeral(value, color=None, scale=1):
+    global DIGIT_ATLAS
+    if DIGIT_ATLAS is None or DIGIT_ATLAS.draft != tex_cache.DRAFT:
+        DIGIT_ATLAS = DigitAtlas()
+    return DIGIT_ATLAS.numeral(value, color, scale)
@@ -0,0 +1,120 @@
+import functools
+import json
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+PROFILER = None
+
+class RenderProfiler:
+    # wall time spans in the chrome trace event format, totals per category
+    # are inclusive so nested spans (tex inside mobjects) are counted in both
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.start_time = time.perf_counter()
+        self.events = []
+        self.calls = []
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.counters = {}
+
+    def add_span(self, name, category, start, end, **args):
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self.start_time) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': 0,
+            'args': args,
+        })
+        self.totals[category] += end - start
+        self.counts[category] += 1
+
+    def add_counter(self, name, value):
+        # sampled values, like the depth of the frame queue, as a counter
+        # track of the trace
+        self.events.append({
+            'name': name,
+            'ph': 'C',
+            'ts': (time.perf_counter() - self.start_time) * 1e6,
+            'pid': os.getpid(),
+            'args': {name: value},
+        })
+        samples, total, peak = self.counters.get(name, (0, 0, value))
+        self.counters[name] = (samples + 1, total + value, max(peak, value))
+
+    @contextmanager
+    def span(self, name, category=None, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, category or name, start, time.perf_counter(), **args)
+
+    def add_call(self, name, source, start, end, frames):
+        self.add_span(name, name, start, end, source=source, frames=frames)
+        self.calls.append({
+            'call': name,
+            'source': source,
+            'seconds': end - start,
+            'frames': frames,
+        })
+
+    def get_peak_rss_megabytes(self):
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes everywhere else
+        return peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+    def write(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, self.scene_name)
+        with open(stem + '.json', 'w') as fp:
+            json.dump({
+                'scene': self.scene_name,
+                'wall_seconds': time.perf_counter() - self.start_time,
+                'peak_rss_megabytes': self.get_peak_rss_megabytes(),
+                'seconds': dict(self.totals),
+                'counts': dict(self.counts),
+                'calls': self.calls,
+                'counters': {
+                    name: {'samples': samples, 'mean': total / samples, 'max': peak}
+                    for name, (samples, total, peak) in self.counters.items()
+                },
+            }, fp, indent=2)
+        with open(stem + '.trace.json', 'w') as fp:
+            json.dump({'traceEvents': self.events}, fp)
+        return stem + '.json'
+
+@contextmanager
+def profile_span(name, category=None, **args):
+    if PROFILER is None:
+        yield
+    else:
+        with PROFILER.span(name, category, **args):
+            yield
+
+def record_counter(name, value):
+    if PROFILER is not None:
+        PROFILER.add_counter(name, value)
+
+def profiled(category):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with profile_span(function.__qualname__, category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_caller_source(skip_file):
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == skip_file:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}'
@@ -0,0 +1,247 @@
+import argparse
+import os
+import subprocess as sp
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+from manimlib.config import get_custom_config, get_module
+from manimlib.constants import FFMPEG_BIN
+from manimlib.extract_scene import is_child_scene
+from manimlib.logger import log
+
+from triangle_scene import PlayTimeline
+
+def parse_cli():
+    parser = argparse.ArgumentParser(description='Render every scene of a module in parallel')
+    parser.add_argument('file', nargs='?', default='video.py')
+    parser.add_argument('scene_names', nargs='*', help='Only render these scenes')
+    parser.add_argument('-q', '--quality', nargs='+', help='camera_qualities tiers, several tiers are rendered in one pass')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of scenes rendered at once')
+    parser.add_argument('--concat', action='store_true', help='Join the scenes, in declared order, into one video')
+    parser.add_argument('--start', type=float, help='Only render from this many seconds into each scene')
+    parser.add_argument('--end', type=float, help='Stop rendering this many seconds into each scene')
+    parser.add_argument('--shards', type=int, help='Split each scene into this many ranges of plays rendered at once')
+    parser.add_argument('--draft', action='store_true', help='Placeholder tex and decimated frames, for timing work')
+    return parser.parse_args()
+
+def get_scene_classes(module):
+    # module globals keep the order the scenes are declared in
+    return [
+        value for value in vars(module).values()
+        if is_child_scene(value, module)
+    ]
+
+def get_output_directory(quality, draft=False):
+    # drafts never overwrite a final render of the same tier
+    return os.path.join(get_custom_config()['directories']['output'], 'draft' if draft else quality)
+
+def get_resolution(quality):
+    width, height = get_custom_config()['camera_qualities'][quality]['resolution'].split('x')
+    return int(width), int(height)
+
+def get_pixel_rate(quality):
+    width, height = get_resolution(quality)
+    return width * height * get_custom_config()['camera_qualities'][quality]['frame_rate']
+
+def has_same_aspect_ratio(quality, other_quality):
+    # scaled to the other height, the width has to land within a pixel,
+    # anything wider or narrower has a frame of its own in manimlib
+    width, height = get_resolution(quality)
+    other_width, other_height = get_resolution(other_quality)
+    return abs(width * other_height / height - other_width) < 1
+
+def get_render_passes(qualities):
+    # the largest tier of each aspect ratio is rasterized, the others of
+    # that ratio are scaled down from it
+    passes = []
+    for quality in sorted(set(qualities), key=get_pixel_rate, reverse=True):
+        for main_quality, extra_qualities in passes:
+            if has_same_aspect_ratio(main_quality, quality):
+                extra_qualities.append(quality)
+                break
+        else:
+            passes.append((quality, []))
+    return passes
+
+def get_quality_tiers():
+    camera_qualities = get_custom_config()['camera_qualities']
+    return sorted((tier for tier in camera_qualities if tier != 'default_quality'), key=get_pixel_rate)
+
+def write_config(directory, **overrides):
+    config = get_custom_config()
+    config.update(overrides)
+    config_file = os.path.join(directory, 'custom_config.yml')
+    with open(config_file, 'w') as fp:
+        yaml.safe_dump(config, fp)
+    return config_file
+
+def get_config_overrides(extra_qualities=(), start=None, end=None, play_map=False, draft=False):
+    overrides = {}
+    if draft:
+        overrides['draft'] = dict(get_custom_config().get('draft', {}), enabled=True)
+    if extra_qualities:
+        overrides['extra_qualities'] = list(extra_qualities)
+    timeline = dict(get_custom_config().get('timeline', {}))
+    if start is not None or end is not None:
+        timeline['time_range'] = [start or 0, end]
+        overrides['timeline'] = timeline
+    if play_map:
+        timeline['play_map'] = True
+        overrides['timeline'] = timeline
+    return overrides
+
+def get_movie_file(output_directory, scene_name):
+    return os.path.join(output_directory, 'videos', scene_name + '.mp4')
+
+def render_scene(file, scene_name, quality, output_directory, config_file=None, extra_args=()):
+    camera_quality = get_custom_config()['camera_qualities'][quality]
+    command = [
+        sys.executable, '-m', 'manimlib', file, scene_name,
+        '-w', '--quiet',
+        '-r', camera_quality['resolution'],
+        '--frame_rate', str(camera_quality['frame_rate']),
+        '--video_dir', output_directory,
+        *extra_args,
+    ]
+    if config_file:
+        command += ['--config_file', config_file]
+    return scene_name, sp.run(command).returncode
+
+def get_timeline(file, scene_name, config_file=None):
+    play_timeline = PlayTimeline(scene_name, file)
+    if not play_timeline.saved:
+        # a pass in skip mode only runs construct, it is what records the
+        # play and wait boundaries. without -w manimlib would open a preview
+        # window, which records nothing and waits for someone to close it
+        with tempfile.TemporaryDirectory() as directory:
+            command = [
+                sys.executable, '-m', 'manimlib', file, scene_name,
+                '-w', '-s', '--quiet',
+                # -s with -w saves the last frame, kept out of the output
+                '--video_dir', directory,
+            ]
+            if config_file:
+                command += ['--config_file', config_file]
+            sp.run(command, check=True)
+        play_timeline = PlayTimeline(scene_name, file)
+        if not play_timeline.saved:
+            raise RuntimeError(f'The timeline pass of {scene_name} recorded no play boundaries at {play_timeline.path}')
+    return play_timeline.saved
+
+def get_shards(boundaries, shards):
+    # contiguous ranges of plays, each about as long as the others
+    if len(boundaries) < 2 or shards < 2:
+        return []
+    total_time = boundaries[-1]['time']
+    cuts = [0]
+    for boundary in boundaries[:-1]:
+        if boundary['time'] >= total_time * len(cuts) / shards:
+            cuts.append(boundary['play'])
+    cuts.append(boundaries[-1]['play'])
+    return list(zip(cuts, cuts[1:]))
+
+def render_sharded_scene(file, scene_name, quality, shards, jobs, config_file=None, extra_qualities=(), draft=False):
+    output_directory = get_output_directory(quality, draft)
+    ranges = get_shards(get_timeline(file, scene_name, config_file), shards)
+    if not ranges:
+        log.info(f'{scene_name} cannot be split into {shards} shards, it is rendered in one piece')
+        return render_scene(file, scene_name, quality, output_directory, config_file)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(
+            lambda play_range: render_scene(
+                file, scene_name, quality, output_directory, config_file,
+                ['-n', '{},{}'.format(*play_range)],
+            ),
+            ranges,
+        ))
+    if any(returncode != 0 for _, returncode in results):
+        return scene_name, 1
+    # every shard is named after its range by manimlib, the extra tiers sit
+    # next to it in their own directories
+    movie_directory = os.path.dirname(get_movie_file(output_directory, scene_name))
+    for directory in [movie_directory, *(os.path.join(movie_directory, extra) for extra in extra_qualities)]:
+        concat_movies(
+            [os.path.join(directory, f'{scene_name}_{start}_{end}.mp4') for start, end in ranges],
+            os.path.join(directory, scene_name + '.mp4'),
+        )
+    return scene_name, 0
+
+def render_scenes(file, scene_names, quality, jobs, config_file=None, draft=False):
+    output_directory = get_output_directory(quality, draft)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            lambda scene_name: render_scene(file, scene_name, quality, output_directory, config_file),
+            scene_names,
+        )
+        failed = [scene_name for scene_name, returncode in results if returncode != 0]
+    for scene_name in failed:
+        log.error(f'{scene_name} failed to render')
+    return failed
+
+def concat_movies(movie_files, movie_file):
+    file_list = os.path.splitext(movie_file)[0] + '_file_list.txt'
+    with open(file_list, 'w') as fp:
+        for part_file in movie_files:
+            fp.write(f"file '{os.path.abspath(part_file)}'\n")
+    sp.run([
+        FFMPEG_BIN, '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', file_list,
+        '-loglevel', 'error',
+        '-c', 'copy',
+        movie_file,
+    ], check=True)
+    os.remove(file_list)
+    log.info(f'File ready at {movie_file}')
+    return movie_file
+
+def concat_scenes(file, scene_names, quality, draft=False):
+    output_directory = get_output_directory(quality, draft)
+    # scenes without any animation (like Thumbnail) never produce a movie
+    movie_files = [
+        get_movie_file(output_directory, scene_name) for scene_name in scene_names
+        if os.path.exists(get_movie_file(output_directory, scene_name))
+    ]
+    movie_file = os.path.join(output_directory, os.path.splitext(os.path.basename(file))[0] + '.mp4')
+    return concat_movies(movie_files, movie_file)
+
+def main():
+    args = parse_cli()
+    if (args.concat or args.shards) and (args.start is not None or args.end is not None):
+        log.error('--concat and --shards work on whole scenes and cannot be used with --start or --end')
+        sys.exit(2)
+    module = get_module(args.file)
+    scene_names = [scene_class.__name__ for scene_class in get_scene_classes(module)]
+    if args.scene_names:
+        scene_names = [scene_name for scene_name in scene_names if scene_name in args.scene_names]
+    qualities = args.quality or [get_custom_config()['camera_qualities']['default_quality']]
+    draft = args.draft or get_custom_config().get('draft', {}).get('enabled', False)
+    if draft:
+        # the scene picks its own resolution and frame rate
+        qualities = [get_custom_config().get('draft', {}).get('quality', 'low')]
+    render_passes = get_render_passes(qualities)
+    for quality, extra_qualities in render_passes:
+        # the shards are cut along the recorded play boundaries
+        overrides = get_config_overrides(extra_qualities, args.start, args.end, play_map=bool(args.shards), draft=args.draft)
+        with tempfile.TemporaryDirectory() as directory:
+            config_file = write_config(directory, **overrides) if overrides else None
+            if args.shards:
+                results = [
+                    render_sharded_scene(args.file, scene_name, quality, args.shards, args.jobs, config_file, extra_qualities, draft)
+                    for scene_name in scene_names
+                ]
+                failed = [scene_name for scene_name, returncode in results if returncode != 0]
+                for scene_name in failed:
+                    log.error(f'{scene_name} failed to render')
+            else:
+                failed = render_scenes(args.file, scene_names, quality, args.jobs, config_file, draft)
+        if failed:
+            sys.exit(1)
+    if args.concat:
+        concat_scenes(args.file, scene_names, render_passes[0][0], draft)
+
+if __name__ == '__main__':
+    main()
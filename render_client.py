@@ -0,0 +1,55 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# only the standard library is imported here, the client has to start
+# faster than the render it asks for
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f'fundamental-triangle-of-sum-{os.getuid()}.sock')
+
+def parse_cli():
+    parser = argparse.ArgumentParser(description='Ask a running render_daemon.py to render scenes')
+    parser.add_argument('scene_names', nargs='+')
+    parser.add_argument('-f', '--file', default='video.py')
+    parser.add_argument('-q', '--quality', nargs='+', help='camera_qualities tiers, the largest one is rasterized')
+    parser.add_argument('--start', type=float, help='Only render from this many seconds into the scene')
+    parser.add_argument('--end', type=float, help='Stop rendering this many seconds into the scene')
+    parser.add_argument('--draft', action='store_true', help='Placeholder tex and decimated frames, for timing work')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    return parser.parse_args()
+
+def send_job(job, socket_path=DEFAULT_SOCKET):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile('rw') as stream:
+            stream.write(json.dumps(job) + '\n')
+            stream.flush()
+            return json.loads(stream.readline())
+
+def main():
+    args = parse_cli()
+    failed = False
+    for scene_name in args.scene_names:
+        try:
+            result = send_job({
+                'file': os.path.abspath(args.file),
+                'scene': scene_name,
+                'qualities': args.quality,
+                'start': args.start,
+                'end': args.end,
+                'draft': args.draft,
+            }, args.socket)
+        except (ConnectionRefusedError, FileNotFoundError):
+            sys.exit(f'No render daemon listening on {args.socket}, start one with python render_daemon.py')
+        if result['status'] == 'ok':
+            print(f"{scene_name}: {result['movie']} ({result['seconds']:.2f}s)")
+        else:
+            print(f"{scene_name} failed:\n{result['error']}", file=sys.stderr)
+            failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import importlib
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import time
+import traceback
+import types
+
+import manimlib.config
+import moderngl
+from manimlib.camera.camera import Camera
+from manimlib.config import get_configuration, get_custom_config, get_module
+from manimlib.extract_scene import get_scene_config
+from manimlib.logger import log
+
+from render import get_config_overrides, get_output_directory, get_render_passes, get_scene_classes, write_config
+from render_client import DEFAULT_SOCKET
+
+def parse_cli():
+    parser = argparse.ArgumentParser(description='Keep manimlib and the scene modules warm between renders')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    parser.add_argument('--preload', nargs='*', default=['video.py'], help='Scene modules imported before the first job')
+    return parser.parse_args()
+
+# the daemon and its command line live next to the scenes too, they are
+# never dropped from sys.modules
+DAEMON_MODULES = ('__main__', 'benchmark', 'render', 'render_client', 'render_daemon')
+
+class ModuleCache:
+    # a scene module is executed again only when it, or one of the helper
+    # modules next to it, changed on disk, and only the helpers that changed
+    # or hold something from a changed one are imported again
+    def __init__(self):
+        self.modules = {}
+
+    def get_local_modules(self, file):
+        directory = os.path.dirname(os.path.abspath(file))
+        return {
+            name: module for name, module in list(sys.modules.items())
+            if name not in DAEMON_MODULES
+            and getattr(module, '__file__', None)
+            and os.path.dirname(os.path.abspath(module.__file__)) == directory
+        }
+
+    def get_mtimes(self, file):
+        files = [file, *(module.__file__ for module in self.get_local_modules(file).values())]
+        return {path: os.stat(path).st_mtime_ns for path in files if os.path.exists(path)}
+
+    def get_stale_modules(self, file, changed_files):
+        local_modules = self.get_local_modules(file)
+        stale = {name for name, module in local_modules.items() if os.path.abspath(module.__file__) in changed_files}
+        while True:
+            # a helper that imported a stale module, or a name from one,
+            # would keep the old copy
+            dependents = {
+                name for name, module in local_modules.items()
+                if name not in stale and any(
+                    getattr(value, '__name__', None) in stale if isinstance(value, types.ModuleType)
+                    else getattr(value, '__module__', None) in stale
+                    for value in list(vars(module).values())
+                )
+            }
+            if not dependents:
+                return stale
+            stale |= dependents
+
+    def get(self, file):
+        file = os.path.abspath(file)
+        if file in self.modules:
+            module, mtimes = self.modules[file]
+            changed_files = {path for path, mtime in self.get_mtimes(file).items() if mtimes.get(path) != mtime}
+            if not changed_files:
+                return module
+            for name in self.get_stale_modules(file, changed_files):
+                log.info(f'Reloading {name}')
+                sys.modules.pop(name, None)
+            log.info(f'Reloading {os.path.basename(file)}')
+        module = get_module(file)
+        self.modules[file] = (module, self.get_mtimes(file))
+        return module
+
+class WarmCamera(Camera):
+    # every job renders in one standalone context with its compiled shader
+    # programs, only the frame buffers are made for the job's resolution
+    context = None
+    idle_fbo = None
+    shader_programs = {'': None}
+
+    def init_context(self, ctx=None):
+        if ctx is not None:
+            return super().init_context(ctx)
+        if WarmCamera.context is None:
+            WarmCamera.context = moderngl.create_standalone_context()
+            WarmCamera.idle_fbo = WarmCamera.context.simple_framebuffer((1, 1))
+        self.ctx = WarmCamera.context
+        self.fbo = self.get_fbo(self.ctx, 0)
+        self.set_ctx_blending()
+        self.fbo_msaa = self.get_fbo(self.ctx, self.samples)
+        self.fbo_msaa.use()
+
+    def init_shaders(self):
+        self.id_to_shader_program = WarmCamera.shader_programs
+
+    def release(self):
+        # moderngl binds back whatever it thinks is bound after making a
+        # frame buffer, that can't be one of the released ones
+        WarmCamera.idle_fbo.use()
+        for fbo in [self.fbo, self.fbo_msaa]:
+            for attachment in [*fbo.color_attachments, fbo.depth_attachment]:
+                if attachment is not None:
+                    attachment.release()
+            fbo.release()
+        for path in list(self.path_to_texture):
+            self.release_texture(path)
+
+def get_camera_class(scene_class):
+    for cls in scene_class.__mro__:
+        config = cls.__dict__.get('CONFIG', {})
+        if 'camera_class' in config:
+            return config['camera_class']
+    return Camera
+
+class RenderDaemon:
+    def __init__(self):
+        self.module_cache = ModuleCache()
+        self.config_file = manimlib.config.__config_file__
+
+    def render(self, job):
+        module = self.module_cache.get(job['file'])
+        qualities = job.get('qualities') or [get_custom_config()['camera_qualities']['default_quality']]
+        draft = job.get('draft', False)
+        if draft:
+            qualities = [get_custom_config().get('draft', {}).get('quality', 'low')]
+        render_passes = get_render_passes(qualities)
+        if len(render_passes) > 1:
+            raise ValueError(f'{", ".join(quality for quality, _ in render_passes)} have different aspect ratios, ask for them in separate jobs')
+        quality, extra_qualities = render_passes[0]
+        camera_quality = get_custom_config()['camera_qualities'][quality]
+        overrides = get_config_overrides(
+            extra_qualities,
+            job.get('start'),
+            job.get('end'),
+            draft=draft,
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            argv = [
+                '-w', '--quiet',
+                '-r', camera_quality['resolution'],
+                '--frame_rate', str(camera_quality['frame_rate']),
+                '--video_dir', get_output_directory(quality, draft),
+            ]
+            if overrides:
+                argv += ['--config_file', write_config(directory, **overrides)]
+            sys_argv = sys.argv
+            sys.argv = ['manimgl', *argv]
+            try:
+                args = manimlib.config.parse_cli()
+                # the module comes from the cache instead of a fresh import
+                config = get_configuration(args)
+                config['module'] = module
+                config['file_writer_config']['input_file_path'] = job['file']
+                # the module may have been imported under another config, draft
+                # or not, and the helper is whichever copy it imported
+                importlib.import_module('tex_cache').install()
+                scene_class = next(
+                    scene_class for scene_class in get_scene_classes(module)
+                    if scene_class.__name__ == job['scene']
+                )
+                scene_config = get_scene_config(config)
+                if get_camera_class(scene_class) is Camera:
+                    scene_config['camera_class'] = WarmCamera
+                scene = scene_class(**scene_config)
+                try:
+                    scene.run()
+                finally:
+                    if isinstance(scene.camera, WarmCamera):
+                        scene.camera.release()
+            finally:
+                sys.argv = sys_argv
+                manimlib.config.__config_file__ = self.config_file
+        return scene.file_writer.get_movie_file_path()
+
+    def handle(self, job):
+        start = time.perf_counter()
+        try:
+            movie = self.render(job)
+        except StopIteration:
+            return {'status': 'error', 'error': f"No scene named {job['scene']} in {job['file']}"}
+        except Exception:
+            return {'status': 'error', 'error': traceback.format_exc()}
+        return {'status': 'ok', 'movie': movie, 'seconds': time.perf_counter() - start}
+
+def serve(socket_path, preload):
+    daemon = RenderDaemon()
+    for file in preload:
+        if os.path.exists(file):
+            daemon.module_cache.get(file)
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            job = json.loads(self.rfile.readline())
+            log.info(f"Rendering {job['scene']}")
+            self.wfile.write((json.dumps(daemon.handle(job)) + '\n').encode())
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    # jobs are served one at a time, scenes share module globals like the
+    # digit atlas and the tex cache
+    with socketserver.UnixStreamServer(socket_path, JobHandler) as server:
+        log.info(f'Render daemon listening on {socket_path}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+def main():
+    args = parse_cli()
+    serve(args.socket, args.preload)
+
+if __name__ == '__main__':
+    main()
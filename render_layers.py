@@ -0,0 +1,144 @@
+import itertools
+
+import numpy as np
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.utils.iterables import batch_by_property
+
+# frame units kept around the frame, so antialiased edges and strokes that
+# reach past a bounding box are never cut
+CULL_MARGIN = 0.1
+
+def get_frame_bounds(camera):
+    frame = camera.frame
+    if np.any(frame.get_euler_angles()):
+        return None
+    half_shape = np.array([frame.get_width(), frame.get_height()]) / 2
+    center = frame.get_center()[:2]
+    return center - half_shape, center + half_shape
+
+def get_margin(mobject):
+    margin = CULL_MARGIN
+    if isinstance(mobject, VMobject):
+        margin += 0.01 * mobject.get_stroke_widths().max(initial=0)
+    if 'radii' in mobject.data:
+        margin += mobject.data['radii'].max(initial=0)
+    return margin
+
+def get_overlap(mobject, bounds):
+    # 1 inside the frame, 0 outside, None when only part of it is
+    if bounds is None:
+        return 1
+    low, _, high = mobject.get_bounding_box()
+    if low[2] != 0 or high[2] != 0:
+        return 1
+    margin = get_margin(mobject)
+    frame_low, frame_high = bounds
+    if np.any(high[:2] + margin < frame_low) or np.any(low[:2] - margin > frame_high):
+        return 0
+    if np.all(low[:2] - margin >= frame_low) and np.all(high[:2] + margin <= frame_high):
+        return 1
+    return None
+
+def is_transparent(mobject):
+    if isinstance(mobject, VMobject):
+        return not mobject.has_fill() and not mobject.has_stroke()
+    return 'rgbas' in mobject.data and not mobject.data['rgbas'][:, 3].any()
+
+def is_visible(mobject, bounds):
+    return not is_transparent(mobject) and get_overlap(mobject, bounds) != 0
+
+def combine_shader_wrappers(shader_wrapper_lists):
+    result = []
+    for shader_wrappers in shader_wrapper_lists:
+        if shader_wrappers:
+            shader_wrapper = shader_wrappers[0]
+            shader_wrapper.combine_with(*shader_wrappers[1:])
+            result.append(shader_wrapper)
+    return result
+
+def get_visible_vmobject_shader_wrappers(vmobject, bounds):
+    # the batching of VMobject.get_shader_wrapper_list over the visible
+    # members only
+    fill_shader_wrappers = []
+    stroke_shader_wrappers = []
+    back_stroke_shader_wrappers = []
+    for submob in vmobject.family_members_with_points():
+        if get_overlap(submob, bounds) == 0:
+            continue
+        if submob.has_fill():
+            fill_shader_wrappers.append(submob.get_fill_shader_wrapper())
+        if submob.has_stroke():
+            if submob.draw_stroke_behind_fill:
+                back_stroke_shader_wrappers.append(submob.get_stroke_shader_wrapper())
+            else:
+                stroke_shader_wrappers.append(submob.get_stroke_shader_wrapper())
+    return combine_shader_wrappers([back_stroke_shader_wrappers, fill_shader_wrappers, stroke_shader_wrappers])
+
+def get_visible_shader_wrappers(mobject, bounds):
+    overlap = get_overlap(mobject, bounds)
+    if overlap == 0:
+        return []
+    if isinstance(mobject, VMobject):
+        # vmobjects already leave out transparent members themselves
+        if overlap == 1:
+            return mobject.get_shader_wrapper_list()
+        return get_visible_vmobject_shader_wrappers(mobject, bounds)
+    own_shader_wrappers = []
+    if mobject.has_points() and is_visible(mobject, bounds):
+        own_shader_wrappers.append(mobject.get_shader_wrapper())
+    # the batching of Mobject.get_shader_wrapper_list
+    shader_wrappers = itertools.chain(
+        own_shader_wrappers,
+        *(get_visible_shader_wrappers(submob, bounds) for submob in mobject.submobjects)
+    )
+    result = []
+    for shader_wrapper_group, _ in batch_by_property(shader_wrappers, lambda shader_wrapper: shader_wrapper.get_id()):
+        shader_wrapper = shader_wrapper_group[0]
+        if not shader_wrapper.is_valid():
+            continue
+        shader_wrapper.combine_with(*shader_wrapper_group[1:])
+        if len(shader_wrapper.vert_data) > 0:
+            result.append(shader_wrapper)
+    return result
+
+def capture_visible(camera, mobjects):
+    camera.refresh_perspective_uniforms()
+    bounds = get_frame_bounds(camera)
+    for mobject in mobjects:
+        if id(mobject) in camera.static_mobject_to_render_group_list:
+            # locked by the scene, its buffers already exist
+            render_groups = camera.get_render_group_list(mobject)
+        else:
+            render_groups = map(camera.get_render_group, get_visible_shader_wrappers(mobject, bounds))
+        for render_group in render_groups:
+            camera.render(render_group)
+
+class StaticLayer:
+    # the mobjects a play never touches, drawn once into their own
+    # framebuffer and copied under every frame of that play
+    def __init__(self, camera, mobjects, cull=True):
+        self.camera = camera
+        self.mobjects = mobjects
+        self.cull = cull
+        self.fbo = None
+
+    def draw(self):
+        if self.fbo is None:
+            self.fbo = self.camera.get_fbo(self.camera.ctx, self.camera.samples)
+            self.fbo.use()
+            self.fbo.clear(*self.camera.background_rgba)
+            if self.cull:
+                capture_visible(self.camera, self.mobjects)
+            else:
+                self.camera.capture(*self.mobjects)
+            self.camera.fbo_msaa.use()
+        self.camera.ctx.copy_framebuffer(self.camera.fbo_msaa, self.fbo)
+
+    def release(self):
+        if self.fbo is None:
+            return
+        for attachment in [*self.fbo.color_attachments, self.fbo.depth_attachment]:
+            if attachment is not None:
+                attachment.release()
+        self.fbo.release()
+        self.fbo = None
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip('manimlib')
+from manimlib.animation.transform import Transform
+from manimlib.mobject.geometry import Square
+from manimlib.utils import rate_functions
+
+from animation_track import AnimationTrack
+
+RATE_FUNCS = [
+    rate_functions.linear,
+    rate_functions.smooth,
+    rate_functions.there_and_back,
+    rate_functions.there_and_back_with_pause,
+    rate_functions.running_start,
+    rate_functions.wiggle,
+    rate_functions.squish_rate_func(rate_functions.smooth, 0.2, 0.7),
+]
+
+def get_sub_alphas(animation, alpha, num_families):
+    # rate_func(clip(alpha * full_length - i * lag_ratio, 0, 1)) per family
+    full_length = (num_families - 1) * animation.lag_ratio + 1
+    return [
+        animation.rate_func(min(max(alpha * full_length - i * animation.lag_ratio, 0), 1))
+        for i in range(num_families)
+    ]
+
+@pytest.mark.parametrize('rate_func', RATE_FUNCS)
+@pytest.mark.parametrize('lag_ratio', [0, 0.1, 1])
+def test_leaf_alphas_ease_each_lag_window(rate_func, lag_ratio):
+    track = AnimationTrack([])
+    animation = Transform(Square(), Square().shift(np.array([1.0, 0, 0])), rate_func=rate_func, lag_ratio=lag_ratio)
+    for alpha in np.linspace(0, 1, 13):
+        leaf_alphas = track.get_leaf_alphas(animation, alpha, 7)
+        assert leaf_alphas.shape == (7,)
+        assert np.allclose(leaf_alphas, get_sub_alphas(animation, alpha, 7))
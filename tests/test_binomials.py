@@ -0,0 +1,85 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from binomials import (
+    FACTORIAL_TABLE_LIMIT, binomial, binomial_batch, binomial_mod, factorial_tables,
+    hockey_stick_sum, is_prime, row_sum,
+)
+
+LARGE_PRIME = 1_000_000_007
+
+def test_binomial_matches_comb():
+    for n in range(0, 120, 7):
+        for k in range(-2, n + 3):
+            assert binomial(n, k) == (math.comb(n, k) if 0 <= k <= n else 0)
+    assert binomial(10 ** 6, 5) == math.comb(10 ** 6, 5)
+
+def test_closed_forms():
+    for n in range(40):
+        assert row_sum(n) == sum(math.comb(n, k) for k in range(n + 1))
+        for k in range(n + 1):
+            assert hockey_stick_sum(n, k) == sum(math.comb(m, k) for m in range(k, n + 1))
+
+def test_is_prime():
+    sieve = np.ones(5000, dtype=bool)
+    sieve[:2] = False
+    for i in range(2, 71):
+        sieve[i * i::i] = False
+    assert [p for p in range(5000) if is_prime(p)] == list(np.flatnonzero(sieve))
+    assert is_prime(LARGE_PRIME)
+    assert is_prime(2 ** 61 - 1)
+    assert not is_prime(561)
+    assert not is_prime(3215031751)
+    assert not is_prime(LARGE_PRIME * 998244353)
+
+@pytest.mark.parametrize('p', [2, 3, 7, 13, 4, 12])
+def test_binomial_mod_small_modulus(p):
+    for n in range(0, 90, 5):
+        for k in range(-1, n + 2):
+            expected = math.comb(n, k) % p if 0 <= k <= n else 0
+            assert binomial_mod(n, k, p) == expected
+
+def test_binomial_mod_large_prime():
+    # digits too large for factorial tables
+    p = 1_000_003
+    assert p > FACTORIAL_TABLE_LIMIT
+    for n, k in [(p - 1, 3), (p + 5, 2), (3 * p - 2, 7), (10 ** 6, 999_990)]:
+        assert binomial_mod(n, k, p) == math.comb(n, k) % p
+    assert binomial_mod(2 * p + 7, p + 3, p) == math.comb(2, 1) * math.comb(7, 3) % p
+    assert binomial_mod(2 * p + 3, p + 7, p) == 0
+    # n = 3p + 5, k = p + 2 has the base p digits (3, 5) and (1, 2)
+    assert binomial_mod(3 * LARGE_PRIME + 5, LARGE_PRIME + 2, LARGE_PRIME) == math.comb(3, 1) * math.comb(5, 2) % LARGE_PRIME
+
+def test_binomial_mod_does_not_tabulate_large_primes():
+    factorial_tables.cache_clear()
+    binomial_mod(10 ** 18 + 3, 12345, LARGE_PRIME)
+    assert factorial_tables.cache_info().currsize == 0
+
+def test_binomial_batch_exact():
+    pairs = [(n, k) for n in range(-1, 70) for k in range(-1, n + 2)]
+    values = binomial_batch(pairs)
+    assert [int(value) for value in values] == [math.comb(n, k) if 0 <= k <= n else 0 for n, k in pairs]
+    large_pairs = [(100, 50), (200, 3), (70, -1)]
+    assert list(binomial_batch(large_pairs)) == [math.comb(100, 50), math.comb(200, 3), 0]
+
+@pytest.mark.parametrize('modulus', [2, 5, 65521, 10, LARGE_PRIME, 2 ** 61 - 1])
+def test_binomial_batch_mod(modulus):
+    rng = np.random.default_rng(modulus)
+    n = rng.integers(0, 10 ** 6, 200)
+    k = rng.integers(-5, 30, 200)
+    pairs = np.stack([n, np.minimum(k, n + 1)], axis=1)
+    values = binomial_batch(pairs, modulus)
+    expected = [binomial_mod(int(n), int(k), modulus) for n, k in pairs]
+    assert [int(value) for value in values] == expected
+    assert all(0 <= int(value) < modulus for value in values)
+
+@pytest.mark.parametrize('modulus', [None, 7, LARGE_PRIME])
+def test_binomial_batch_empty(modulus):
+    for pairs in ([], np.zeros((0, 2), dtype=np.int64)):
+        values = binomial_batch(pairs, modulus)
+        assert values.shape == (0,)
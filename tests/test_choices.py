@@ -0,0 +1,53 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip('manimlib')
+from manimlib.mobject.geometry import RegularPolygon
+from manimlib.mobject.types.vectorized_mobject import VGroup
+
+from video import find_choices, iter_choice_chunks, iter_choices
+
+def make_options(n):
+    return VGroup(*(RegularPolygon(3 + i) for i in range(n))).arrange()
+
+def test_iter_choices_is_lazy_and_ordered():
+    options = make_options(5)
+    choices = iter_choices(options, 2)
+    first = next(choices)
+    assert [submob.n for submob in first] == [3, 4]
+    assert len(list(choices)) == math.comb(5, 2) - 1
+    assert list(iter_choices(options, 6)) == []
+
+def test_choices_share_pool_geometry():
+    options = make_options(4)
+    points = [option.get_points().copy() for option in options]
+    choices = list(iter_choices(options, 2))
+    assert np.shares_memory(choices[0][0].data.peek('fill_rgba'), choices[1][0].data.peek('fill_rgba'))
+    assert np.shares_memory(choices[0][0].data.peek('points'), choices[2][0].data.peek('points'))
+    choices[0].shift(np.array([1.0, 0, 0]))
+    assert not np.shares_memory(choices[0][0].data.peek('points'), choices[2][0].data.peek('points'))
+    assert np.allclose(choices[2][0].get_points(), points[0])
+    for option, option_points in zip(options, points):
+        assert np.allclose(option.get_points(), option_points)
+
+def test_find_choices_matches_iter_choices():
+    options = make_options(5)
+    found = find_choices(options, 3)
+    streamed = list(iter_choices(options, 3))
+    assert len(found) == len(streamed) == math.comb(5, 3)
+    for choice, other in zip(found, streamed):
+        assert [submob.n for submob in choice] == [submob.n for submob in other]
+
+@pytest.mark.parametrize('n, k', [(8, 3), (10, 4)])
+def test_chunks_cover_every_choice(n, k):
+    chunks = list(iter_choice_chunks(make_options(n), k, chunk_size=16))
+    assert sum(len(chunk) for chunk in chunks) == math.comb(n, k)
+    assert all(len(chunk) == 16 for chunk in chunks[:-1])
+    for chunk in chunks:
+        lefts = [choice.get_left()[0] for choice in chunk]
+        assert lefts == sorted(lefts)
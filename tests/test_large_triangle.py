@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip('manimlib')
+from manimlib.constants import RIGHT, UP
+
+from binomials import binomial_mod
+from video import LargePascalTriangle, triangular_number
+
+def grown_triangle(rows, modulus=2, start=None):
+    triangle = LargePascalTriangle(modulus)
+    if start is not None:
+        triangle.generate(start)
+    while triangle.row_count < rows:
+        triangle.generate_next_row()
+    return triangle
+
+def relative_points(triangle):
+    points = triangle.group.get_points()
+    return points - points[0]
+
+@pytest.mark.parametrize('start', [None, 0, 1, 4])
+def test_grown_rows_match_generate(start):
+    generated = LargePascalTriangle(3)
+    generated.generate(12)
+    grown = grown_triangle(13, 3, start)
+    assert grown.row_count == generated.row_count
+    assert np.array_equal(grown.values, generated.values)
+    assert np.allclose(relative_points(grown), relative_points(generated))
+    assert np.allclose(grown.group.get_radii(), generated.group.get_radii())
+
+def test_moved_triangle_grows_in_place():
+    triangle = LargePascalTriangle()
+    triangle.generate(5)
+    triangle.group.scale(3).shift(RIGHT + 2 * UP)
+    triangle.generate_next_row()
+    expected = LargePascalTriangle()
+    expected.generate(6)
+    expected.group.scale(3, about_point=expected.group.get_points()[0])
+    assert np.allclose(relative_points(triangle), relative_points(expected))
+
+@pytest.mark.parametrize('modulus', [2, 3, 5, 7])
+def test_values_match_binomial_mod(modulus):
+    triangle = LargePascalTriangle(modulus)
+    triangle.generate(40)
+    for row in range(41):
+        assert len(triangle.values[triangle.get_row_slice(row)]) == row + 1
+        for col in range(row + 1):
+            assert triangle.calculate_collumn(row, col) == binomial_mod(row, col, modulus)
+    assert len(triangle.values) == triangular_number(41)
+
+def test_grow_next_row_grows_only_the_new_row():
+    triangle = LargePascalTriangle()
+    triangle.generate(4)
+    radii = triangle.group.get_radii()[:, 0].copy()
+    animation = triangle.grow_next_row()
+    new_row = triangle.get_row_slice(5)
+    assert np.all(triangle.group.get_radii()[new_row] == 0)
+    animation.interpolate(1)
+    assert np.allclose(triangle.group.get_radii()[new_row], triangle.dot_radius)
+    assert np.allclose(triangle.group.get_radii()[:len(radii), 0], radii)
+
+@pytest.mark.parametrize('grow', [False, True])
+def test_focus_on_fades_only_the_other_rows(grow):
+    triangle = LargePascalTriangle()
+    triangle.generate(4)
+    if grow:
+        triangle.grow_next_row().interpolate(1)
+    focused = triangle.get_row_slice(3)
+    others = np.ones(len(triangle.values), dtype=bool)
+    others[focused] = False
+    opacities = triangle.group.data['rgbas'][:, 3].copy()
+    animations = triangle.focus_on(3)
+    for animation in animations:
+        animation.interpolate(1)
+    assert np.allclose(triangle.group.data['rgbas'][focused, 3], opacities[focused])
+    assert np.allclose(triangle.group.data['rgbas'][others, 3], 0)
+    for animation in triangle.unfocus():
+        animation.begin()
+        animation.interpolate(1)
+        animation.finish()
+    assert triangle.focused_on is None
+    assert np.allclose(triangle.group.data['rgbas'][:, 3], opacities)
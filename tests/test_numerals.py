@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip('manimlib')
+from manimlib.constants import RIGHT
+from manimlib.mobject.geometry import Square
+from manimlib.mobject.types.vectorized_mobject import VGroup
+
+from numerals import NumeralGlyph
+
+SHARED_KEYS = ('points', 'fill_rgba', 'stroke_rgba', 'stroke_width')
+
+def make_glyph():
+    return NumeralGlyph(Square().set_fill(opacity=1))
+
+def shares(glyph, other, key):
+    return np.shares_memory(glyph.data.peek(key), other.data.peek(key))
+
+def test_copies_share_buffers():
+    glyph = make_glyph()
+    copy = glyph.copy()
+    for key in SHARED_KEYS:
+        assert shares(glyph, copy, key)
+
+def test_measured_and_rendered_copy_still_shares():
+    glyph = make_glyph()
+    copy = glyph.copy()
+    group = VGroup(copy)
+    group.get_center()
+    copy.get_center()
+    copy.get_width()
+    assert copy.has_fill() and copy.has_stroke()
+    assert len(group.get_shader_wrapper_list()) > 0
+    for key in SHARED_KEYS:
+        assert shares(glyph, copy, key)
+
+def test_mutated_copy_gets_private_points():
+    glyph = make_glyph()
+    points = glyph.data.peek('points').copy()
+    copy = glyph.copy()
+    VGroup(copy).shift(RIGHT)
+    assert not shares(glyph, copy, 'points')
+    assert np.allclose(glyph.data.peek('points'), points)
+    assert np.allclose(copy.data.peek('points'), points + RIGHT)
+    assert shares(glyph, copy, 'fill_rgba')
+
+def test_recolored_copy_gets_private_colors():
+    glyph = make_glyph()
+    fill_rgba = glyph.data.peek('fill_rgba').copy()
+    copy = glyph.copy()
+    copy.set_fill('#ff0000')
+    assert not shares(glyph, copy, 'fill_rgba')
+    assert np.allclose(glyph.data.peek('fill_rgba'), fill_rgba)
+    assert shares(glyph, copy, 'points')
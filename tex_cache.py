@@ -0,0 +1,174 @@
+import atexit
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+import svgelements as se
+import manimlib.mobject.svg.svg_mobject as svg_mobject
+import manimlib.mobject.svg.tex_mobject as tex_mobject
+import manimlib.utils.tex_file_writing as tex_file_writing
+from manimlib.config import get_custom_config
+from manimlib.logger import log
+
+from profiler import profiled
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'fundamental-triangle-of-sum',
+    'tex',
+)
+DEFAULT_MAX_MEGABYTES = 256
+# the advance and height of a 10pt glyph in svg units, only used for
+# expressions that were never compiled
+ESTIMATED_GLYPH_SIZE = (6.7, 9.3)
+SVG_SHAPES = (se.Path, se.SimpleLine, se.Rect, se.Circle, se.Ellipse, se.Polygon, se.Polyline)
+
+def write_svg(svg_file, boxes):
+    paths = ''.join(
+        f'<path d="M {x0:.4f} {y0:.4f} H {x1:.4f} V {y1:.4f} H {x0:.4f} Z"/>'
+        for x0, y0, x1, y1 in boxes
+    )
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(svg_file), suffix='.svg')
+    with os.fdopen(fd, 'w') as fp:
+        fp.write(f'<svg xmlns="http://www.w3.org/2000/svg">{paths}</svg>')
+    os.replace(temp_path, svg_file)
+
+def get_glyph_boxes(svg_file):
+    # the same shapes SVGMobject turns into submobjects, with every
+    # transform already applied, so each box sits where its glyph does
+    boxes = []
+    for shape in se.SVG.parse(svg_file).elements():
+        if isinstance(shape, SVG_SHAPES):
+            box = shape.bbox()
+            if box is not None:
+                boxes.append(box)
+    return boxes
+
+def get_estimated_glyph_boxes(tex_file_content):
+    tex_config = tex_file_writing.get_tex_config()
+    before, _, after = tex_config['tex_body'].partition(tex_config['text_to_replace'])
+    expression = tex_file_content[len(before):len(tex_file_content) - len(after)]
+    expression = re.sub(r'\\begin\{.*?\}|\\end\{.*?\}|\\[a-zA-Z]+|[{}\s&^_$]', '', expression)
+    width, height = ESTIMATED_GLYPH_SIZE
+    return [(index * width, -height, (index + 1) * width, 0) for index in range(len(expression))]
+
+class TexCache:
+    # svg files keyed on everything that changes what xelatex produces, shared
+    # between scenes and between processes rendering at the same time
+    def __init__(self, directory=None, max_megabytes=DEFAULT_MAX_MEGABYTES):
+        self.directory = directory or DEFAULT_CACHE_DIRECTORY
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_megabytes * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, tex_file_content):
+        tex_config = tex_file_writing.get_tex_config()
+        hasher = hashlib.sha256()
+        for part in (
+            tex_file_content,
+            tex_config['template_file'],
+            tex_config['tex_body'],
+            tex_config['executable'],
+            tex_config['intermediate_filetype'],
+        ):
+            hasher.update(part.encode())
+            hasher.update(b'\0')
+        return hasher.hexdigest()
+
+    def get_svg_file(self, tex_file_content):
+        svg_file = os.path.join(self.directory, self.key(tex_file_content) + '.svg')
+        try:
+            # bumping the mtime is what marks an entry as recently used
+            os.utime(svg_file)
+            self.hits += 1
+            return svg_file
+        except FileNotFoundError:
+            pass
+        self.misses += 1
+        self.compile(tex_file_content, svg_file)
+        self.evict()
+        return svg_file
+
+    def get_draft_svg_file(self, tex_file_content):
+        key = self.key(tex_file_content)
+        draft_file = os.path.join(self.directory, key + '.draft.svg')
+        try:
+            os.utime(draft_file)
+            return draft_file
+        except FileNotFoundError:
+            pass
+        svg_file = os.path.join(self.directory, key + '.svg')
+        if os.path.exists(svg_file):
+            # a box per glyph of the typeset svg keeps the layout and the
+            # number of submobjects exactly as in the final render
+            write_svg(draft_file, get_glyph_boxes(svg_file))
+            return draft_file
+        log.warning('No typeset svg cached for an expression, its draft layout is estimated')
+        estimate_file = os.path.join(self.directory, key + '.estimate.svg')
+        write_svg(estimate_file, get_estimated_glyph_boxes(tex_file_content))
+        return estimate_file
+
+    @profiled('tex')
+    def compile(self, tex_file_content, svg_file):
+        # compile in a private directory and rename into place so a parallel
+        # render never sees a half written svg
+        work_dir = tempfile.mkdtemp(dir=self.directory)
+        try:
+            compiled_svg = tex_file_writing.tex_to_svg(
+                tex_file_content, os.path.join(work_dir, 'expression.svg')
+            )
+            os.replace(compiled_svg, svg_file)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def evict(self):
+        entries = []
+        for file in os.scandir(self.directory):
+            if file.name.endswith('.svg'):
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, file.path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def report(self):
+        if self.hits + self.misses > 0:
+            log.info(f'TeX cache: {self.hits} hits, {self.misses} misses ({self.directory})')
+
+TEX_CACHE = None
+DRAFT = False
+
+def install():
+    global TEX_CACHE, DRAFT
+    draft = bool(get_custom_config().get('draft', {}).get('enabled'))
+    if TEX_CACHE is None or draft != DRAFT:
+        # mobjects parsed from the other kind of svg, possibly by a module
+        # the daemon has since reloaded
+        svg_mobject.SVG_HASH_TO_MOB_MAP.clear()
+        DRAFT = draft
+    if TEX_CACHE is None:
+        cache_config = get_custom_config().get('tex_cache', {})
+        TEX_CACHE = TexCache(
+            cache_config.get('directory') or None,
+            cache_config.get('max_megabytes', DEFAULT_MAX_MEGABYTES),
+        )
+        atexit.register(TEX_CACHE.report)
+    # picked on every install, a warm daemon can switch between draft jobs
+    # and final ones
+    if DRAFT:
+        tex_mobject.tex_to_svg_file = TEX_CACHE.get_draft_svg_file
+    else:
+        tex_mobject.tex_to_svg_file = TEX_CACHE.get_svg_file
+    return TEX_CACHE
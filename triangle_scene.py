@@ -0,0 +1,583 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess as sp
+import tempfile
+import time
+import types
+from contextlib import contextmanager
+
+import numpy as np
+from manimlib.animation.animation import Animation
+from manimlib.config import get_custom_config
+from manimlib.constants import DEFAULT_WAIT_TIME, FFMPEG_BIN
+from manimlib.logger import log
+from manimlib.mobject.mobject import Mobject
+from manimlib.scene.scene import EndSceneEarlyException, Scene
+from manimlib.scene.scene_file_writer import ProgressDisplay, SceneFileWriter
+from manimlib.utils.directories import get_temp_dir
+
+import profiler
+from animation_track import AnimationTrack
+from frame_pipeline import FramePipeline, FramePool, read_frame_into
+from profiler import RenderProfiler, get_caller_source, profile_span, record_counter
+from render_layers import StaticLayer, capture_visible
+
+class UncachableValue(Exception):
+    pass
+
+def hash_value(hasher, value):
+    # everything a segment depends on, a value this cannot cover raises so
+    # the segment is rendered instead of matched against a stale movie
+    if isinstance(value, Mobject):
+        for mobject in value.get_family():
+            hash_mobject_data(hasher, mobject)
+    elif isinstance(value, Animation):
+        hasher.update(type(value).__name__.encode())
+        for key, attribute in sorted(vars(value).items()):
+            hasher.update(key.encode())
+            hash_value(hasher, attribute)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(type(value).__name__.encode())
+        for item in value:
+            hash_value(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(b'dict')
+        for key, item in sorted(value.items(), key=lambda entry: repr(entry[0])):
+            hash_value(hasher, key)
+            hash_value(hasher, item)
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(b'set')
+        for item in sorted(value, key=repr):
+            hash_value(hasher, item)
+    elif isinstance(value, np.ndarray):
+        hasher.update(repr((value.dtype, value.shape)).encode())
+        hasher.update(np.ascontiguousarray(value))
+    elif isinstance(value, (int, float, complex, str, bytes, bool, slice, type(None), np.generic)):
+        hasher.update(repr(value).encode())
+    elif isinstance(value, types.FunctionType):
+        # lambdas and nested helpers share a qualname, their code and the
+        # values they closed over are what tells them apart
+        hasher.update(value.__qualname__.encode())
+        hash_code(hasher, value.__code__)
+        hash_value(hasher, value.__defaults__)
+        hash_value(hasher, value.__kwdefaults__)
+        for cell in value.__closure__ or ():
+            try:
+                hash_value(hasher, cell.cell_contents)
+            except ValueError:
+                hasher.update(b'empty cell')
+    elif isinstance(value, types.MethodType):
+        hash_value(hasher, value.__func__)
+        hash_value(hasher, value.__self__)
+    elif isinstance(value, (types.BuiltinFunctionType, np.ufunc, type)):
+        hasher.update(f'{getattr(value, "__module__", None)}.{value.__qualname__ if isinstance(value, type) else value.__name__}'.encode())
+    else:
+        raise UncachableValue(type(value).__name__)
+
+def hash_code(hasher, code):
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            hash_code(hasher, const)
+        else:
+            hasher.update(repr(const).encode())
+
+def get_source_hash(source_file):
+    # the scene file and the helper modules next to it, an edit to any of
+    # them can change what a scene draws
+    directory = os.path.dirname(os.path.abspath(source_file))
+    hasher = hashlib.blake2b(digest_size=16)
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if entry.name.endswith('.py') and entry.is_file():
+            hasher.update(entry.name.encode())
+            with open(entry.path, 'rb') as fp:
+                hasher.update(fp.read())
+    return hasher.hexdigest()
+
+def hash_mobject_data(hasher, mobject):
+    hasher.update(type(mobject).__name__.encode())
+    for key, array in mobject.data.items():
+        hasher.update(key.encode())
+        hasher.update(np.ascontiguousarray(array))
+    hasher.update(repr(sorted(mobject.uniforms.items())).encode())
+
+def get_draft_camera_config(camera_config, draft_config):
+    camera_quality = get_custom_config()['camera_qualities'][draft_config.get('quality', 'low')]
+    width, height = camera_quality['resolution'].split('x')
+    return dict(
+        camera_config,
+        pixel_width=int(width),
+        pixel_height=int(height),
+        frame_rate=max(camera_quality['frame_rate'] // draft_config.get('frame_rate_divisor', 1), 1),
+        anti_alias_width=0,
+        samples=0,
+    )
+
+class TriangleFileWriter(SceneFileWriter):
+    def __init__(self, scene, **kwargs):
+        super().__init__(scene, **kwargs)
+        self.last_raw_bytes = None
+        self.segment_key = None
+        self.extra_qualities = get_custom_config().get('extra_qualities') or []
+        self.extra_writing_processes = []
+        self.draft = get_custom_config().get('draft', {}).get('enabled', False)
+        if self.draft:
+            # one movie growing as it is rendered, which a player can follow
+            self.extra_qualities = []
+            self.break_into_partial_movies = False
+        camera = self.scene.camera
+        camera_qualities = get_custom_config()['camera_qualities']
+        for quality in self.extra_qualities:
+            extra_width, extra_height = map(int, camera_qualities[quality]['resolution'].split('x'))
+            if abs(camera.pixel_width * extra_height / camera.pixel_height - extra_width) >= 1:
+                # scaling would squash it, manimlib gives it a frame of its own
+                raise ValueError(f'{quality} does not have the aspect ratio of the {camera.pixel_width}x{camera.pixel_height} render, it needs a pass of its own')
+        if self.extra_qualities:
+            # the other tiers come out of the same frames, which the per play
+            # partial movies and their cache do not know how to split
+            self.break_into_partial_movies = False
+        pipeline_config = get_custom_config().get('frame_pipeline', {})
+        self.use_frame_pipeline = pipeline_config.get('enabled', False)
+        self.encoder_threads = pipeline_config.get('encoder_threads', 0)
+        self.queue_frames = pipeline_config.get('queue_frames', 8)
+        self.use_ring_file = pipeline_config.get('ring_file', False)
+        self.frame_pool = None
+        self.frame_pipeline = None
+        self.last_frame = None
+
+    def get_encoder_args(self):
+        if self.movie_file_extension == '.mov':
+            return ['-vcodec', 'qtrle']
+        if self.movie_file_extension == '.gif':
+            return []
+        args = ['-vcodec', 'libx264']
+        if self.draft:
+            args += ['-preset', 'ultrafast', '-tune', 'zerolatency']
+        args += ['-pix_fmt', 'yuv420p']
+        if self.encoder_threads:
+            args += ['-threads', str(self.encoder_threads)]
+        if self.draft:
+            # fragments are written as they are encoded, so the temp file
+            # plays while the scene is still rendering
+            args += ['-movflags', 'frag_keyframe+empty_moov+default_base_moof']
+        return args
+
+    def get_movie_command(self, fps, filters, file_path):
+        width, height = self.scene.camera.get_pixel_shape()
+        return [
+            FFMPEG_BIN,
+            '-y',
+            '-f', 'rawvideo',
+            '-s', f'{width}x{height}',
+            '-pix_fmt', 'rgba',
+            '-r', str(fps),
+            '-i', '-',
+            '-vf', ','.join(filters),
+            '-an',
+            '-loglevel', 'error',
+            *self.get_encoder_args(),
+            file_path,
+        ]
+
+    def open_movie_pipe(self, file_path):
+        # the pipe of SceneFileWriter.open_movie_pipe, with the encoder
+        # settings of the draft and the frame pipeline
+        stem, ext = os.path.splitext(file_path)
+        self.final_file_path = file_path
+        self.temp_file_path = stem + '_temp' + ext
+        fps = self.scene.camera.frame_rate
+        self.writing_process = sp.Popen(self.get_movie_command(fps, ['vflip'], self.temp_file_path), stdin=sp.PIPE)
+        if self.draft:
+            log.info(f'Streaming draft to {self.temp_file_path}')
+        if self.total_frames > 0:
+            self.progress_display = ProgressDisplay(
+                range(self.total_frames),
+                leave=self.leave_progress_bars,
+                ascii=True if platform.system() == 'Windows' else None,
+                dynamic_ncols=True,
+            )
+            self.has_progress_display = True
+        self.frame_index = 0
+        camera_qualities = get_custom_config()['camera_qualities']
+        for quality in self.extra_qualities:
+            extra_width, extra_height = camera_qualities[quality]['resolution'].split('x')
+            extra_fps = camera_qualities[quality]['frame_rate']
+            filters = ['vflip', f'scale={extra_width}:{extra_height}:flags=area']
+            if fps % extra_fps == 0:
+                # whole ratios are decimated here, so skipped frames are never piped
+                frame_step = fps // extra_fps
+            else:
+                frame_step = 1
+                filters.append(f'fps={extra_fps}')
+            extra_file_path = os.path.join(os.path.dirname(file_path), quality, os.path.basename(file_path))
+            os.makedirs(os.path.dirname(extra_file_path), exist_ok=True)
+            command = self.get_movie_command(fps // frame_step, filters, extra_file_path)
+            self.extra_writing_processes.append((sp.Popen(command, stdin=sp.PIPE), frame_step))
+        if self.use_frame_pipeline:
+            self.open_frame_pipeline()
+
+    def open_frame_pipeline(self):
+        if self.frame_pool is None:
+            # kept for the whole scene, the partial movies of every play
+            # reuse the same buffers
+            width, height = self.scene.camera.get_pixel_shape()
+            ring_directory = os.path.join(get_temp_dir(), 'frame_rings') if self.use_ring_file else None
+            self.frame_pool = FramePool(width * height * self.scene.camera.n_channels, self.queue_frames, ring_directory)
+        self.frame_pipeline = FramePipeline(self.frame_pool, [
+            (self.writing_process.stdin, 1),
+            *((writing_process.stdin, frame_step) for writing_process, frame_step in self.extra_writing_processes),
+        ])
+
+    def write_frame(self, camera):
+        if self.write_to_movie:
+            if self.frame_pipeline is not None:
+                self.queue_frame(camera)
+            else:
+                self.pipe_frame(camera)
+            self.frame_index += 1
+            if self.has_progress_display:
+                self.progress_display.update()
+
+    def pipe_frame(self, camera):
+        # a frame the scene did not redraw is piped again as is, so the
+        # encoder sees exactly the same stream as before
+        if self.scene.frame_changed or self.last_raw_bytes is None:
+            with profile_span('readback', 'rasterize'):
+                self.last_raw_bytes = camera.get_raw_fbo_data()
+        with profile_span('write', 'encode'):
+            self.writing_process.stdin.write(self.last_raw_bytes)
+            for writing_process, frame_step in self.extra_writing_processes:
+                if self.frame_index % frame_step == 0:
+                    writing_process.stdin.write(self.last_raw_bytes)
+
+    def queue_frame(self, camera):
+        # the same reuse, a frame the scene did not redraw is queued again
+        # from the buffer it is already in
+        if self.scene.frame_changed or self.last_frame is None:
+            with profile_span('acquire', 'backpressure'):
+                index = self.frame_pool.acquire()
+            with profile_span('readback', 'rasterize'):
+                read_frame_into(camera, self.frame_pool.frames[index])
+            if self.last_frame is not None:
+                self.frame_pool.release(self.last_frame)
+            self.last_frame = index
+        with profile_span('write', 'encode'):
+            self.frame_pipeline.submit(self.last_frame)
+        record_counter('frame_queue', self.frame_pool.get_depth())
+
+    def close_movie_pipe(self):
+        if self.frame_pipeline is not None:
+            # every queued frame reaches its encoder before the pipes close
+            with profile_span('drain', 'encode'):
+                self.frame_pipeline.close()
+            self.frame_pipeline = None
+        super().close_movie_pipe()
+        for writing_process, _ in self.extra_writing_processes:
+            writing_process.stdin.close()
+            writing_process.wait()
+        self.extra_writing_processes = []
+
+    def finish(self):
+        super().finish()
+        if self.frame_pool is not None:
+            self.frame_pool.close()
+            self.frame_pool = None
+            self.last_frame = None
+
+    def get_partial_movie_cache_path(self, segment_key):
+        cache_directory = os.path.join(get_temp_dir(), 'partial_movie_cache')
+        os.makedirs(cache_directory, exist_ok=True)
+        return os.path.join(cache_directory, segment_key + self.movie_file_extension)
+
+    def use_cached_partial_movie(self, segment_key):
+        cached_movie = self.get_partial_movie_cache_path(segment_key)
+        try:
+            shutil.copyfile(cached_movie, self.get_next_partial_movie_path())
+        except FileNotFoundError:
+            return False
+        return True
+
+    def end_animation(self):
+        super().end_animation()
+        if self.segment_key is not None and self.break_into_partial_movies and self.write_to_movie:
+            cached_movie = self.get_partial_movie_cache_path(self.segment_key)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cached_movie), suffix=self.movie_file_extension)
+            os.close(fd)
+            shutil.copyfile(self.final_file_path, temp_path)
+            os.replace(temp_path, cached_movie)
+        self.segment_key = None
+
+class PlayTimeline:
+    # the play and wait boundaries of the last run, the scene time each one
+    # ends at and a key of the scene state there, kept until the scene or a
+    # helper module changes. nothing is restored from it, it maps scene
+    # time to play indices for render.py to cut shards along and catches a
+    # timeline that is not deterministic
+    def __init__(self, scene_name, source_file):
+        self.path = os.path.join(get_temp_dir(), 'timelines', scene_name + '.json')
+        self.source_hash = get_source_hash(source_file)
+        self.saved = self.load()
+        self.boundaries = []
+        self.diverged = False
+
+    def load(self):
+        try:
+            with open(self.path) as fp:
+                timeline = json.load(fp)
+        except (FileNotFoundError, ValueError):
+            return []
+        if timeline.get('source_hash') != self.source_hash:
+            return []
+        return timeline['boundaries']
+
+    def record(self, play, time, state):
+        index = len(self.boundaries)
+        if not self.diverged and index < len(self.saved) and self.saved[index]['state'] != state:
+            log.warning(f'Scene state at play {play} differs from the last run, the timeline is not deterministic')
+            self.diverged = True
+        self.boundaries.append({'play': play, 'time': time, 'state': state})
+
+    def save(self):
+        boundaries = self.boundaries
+        if not self.diverged:
+            # a seek stops early, the rest of the last full run still holds
+            boundaries = boundaries + self.saved[len(boundaries):]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.json')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump({'source_hash': self.source_hash, 'boundaries': boundaries}, fp)
+        os.replace(temp_path, self.path)
+
+class TriangleScene(Scene):
+    def __init__(self, **kwargs):
+        draft_config = get_custom_config().get('draft', {})
+        if draft_config.get('enabled'):
+            # decimated, aliased frames at the draft tier, the tex in it is
+            # already swapped for placeholder boxes by tex_cache
+            kwargs['camera_config'] = get_draft_camera_config(kwargs.get('camera_config', {}), draft_config)
+            draft_frame_rate = kwargs['camera_config']['frame_rate']
+        super().__init__(**kwargs)
+        if draft_config.get('enabled'):
+            # Scene pins the preview window to 30fps
+            self.camera.frame_rate = draft_frame_rate
+        timeline_config = get_custom_config().get('timeline', {})
+        self.time_range = timeline_config.get('time_range')
+        file_writer_config = dict(self.file_writer_config)
+        if self.time_range is not None and not file_writer_config.get('file_name'):
+            # a range never overwrites the movie of the whole scene
+            start, end = self.time_range
+            file_writer_config['file_name'] = f'{self}_{start:g}-{end:g}' if end is not None else f'{self}_{start:g}-'
+        self.file_writer = TriangleFileWriter(self, **file_writer_config)
+        self.bake_animations = get_custom_config().get('bake_animations', False)
+        self.cull_mobjects = get_custom_config().get('cull_mobjects', False)
+        self.use_static_layers = get_custom_config().get('static_layers', False)
+        self.static_layer = None
+        self.play_timeline = None
+        if timeline_config.get('play_map') and self.window is None:
+            self.play_timeline = PlayTimeline(str(self), type(self).construct.__code__.co_filename)
+        self.source_hash = get_source_hash(type(self).construct.__code__.co_filename)
+        self.last_frame_key = None
+        self.frame_changed = True
+        self.frames_emitted = 0
+        self.profiler = None
+        profiling_config = get_custom_config().get('profiling', {})
+        if profiling_config.get('enabled') and self.file_writer.write_to_movie:
+            self.profiler = profiler.PROFILER = RenderProfiler(str(self))
+            self.profile_directory = profiling_config.get('directory', 'profiles')
+            self.last_call_end = self.profiler.start_time
+
+    @contextmanager
+    def profile_call(self, name, source):
+        if self.profiler is None:
+            yield
+            return
+        start = time.perf_counter()
+        self.profiler.add_span('construct', 'construct', self.last_call_end, start, source=source)
+        frames_emitted = self.frames_emitted
+        try:
+            yield
+        finally:
+            self.last_call_end = time.perf_counter()
+            self.profiler.add_call(name, source, start, self.last_call_end, self.frames_emitted - frames_emitted)
+
+    def get_frame_key(self):
+        hasher = hashlib.blake2b(digest_size=16)
+        for mobject in self.get_mobject_family_members():
+            hash_mobject_data(hasher, mobject)
+        return hasher.digest()
+
+    def get_segment_key(self, *parameters):
+        # the state going in plus what is played on it fully decides the
+        # frames of a play or wait at a given quality
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr(sorted(self.camera_config.items())).encode())
+        hasher.update(self.file_writer.movie_file_extension.encode())
+        hasher.update(self.source_hash.encode())
+        hasher.update(self.get_frame_key())
+        try:
+            for parameter in parameters:
+                hash_value(hasher, parameter)
+        except UncachableValue as error:
+            log.debug(f'Not caching a segment that depends on a {error}')
+            return None
+        except RecursionError:
+            # a closure that reaches itself
+            return None
+        return hasher.hexdigest()
+
+    def caches_partial_movies(self):
+        return all([
+            self.file_writer.write_to_movie,
+            self.file_writer.break_into_partial_movies,
+            not self.skip_animations,
+            not self.presenter_mode,
+            self.window is None,
+        ])
+
+    def play_segment(self, segment_key, play_like_call, *args, **kwargs):
+        if not self.file_writer.use_cached_partial_movie(segment_key):
+            self.file_writer.segment_key = segment_key
+            return play_like_call(*args, **kwargs)
+        # the movie is already on disk, only the scene state has to move on
+        self.skip_animations = True
+        try:
+            return play_like_call(*args, **kwargs)
+        finally:
+            self.skip_animations = False
+
+    def seek(self, run_time):
+        # time range rendering: construct still runs from the top, calls
+        # that end before the range are skipped the way -n skips plays, and
+        # the one the range starts in is rendered from its own start
+        if self.time_range is None:
+            return
+        start, end = self.time_range
+        if end is not None and self.time >= end:
+            raise EndSceneEarlyException()
+        self.skip_animations = self.original_skipping_status or self.time + run_time <= start
+        if not self.skip_animations and self.start_at_animation_number is None:
+            # partial movies from before the range are left out of the combine
+            self.start_at_animation_number = self.num_plays
+
+    def record_boundary(self):
+        if self.play_timeline is not None:
+            self.play_timeline.record(self.num_plays, self.time, self.get_frame_key().hex())
+
+    def play(self, *args, **kwargs):
+        with self.profile_call('play', get_caller_source(__file__)):
+            if len(args) == 0:
+                return super().play(*args, **kwargs)
+            animations = self.anims_from_play_args(*args, **kwargs)
+            self.seek(self.get_run_time(animations))
+            segment_key = self.get_segment_key('play', animations) if self.caches_partial_movies() else None
+            if segment_key is None:
+                result = super().play(*animations)
+            else:
+                result = self.play_segment(segment_key, super().play, *animations)
+            self.record_boundary()
+            return result
+
+    def wait(self, duration=DEFAULT_WAIT_TIME, stop_condition=None, **kwargs):
+        with self.profile_call('wait', get_caller_source(__file__)):
+            self.seek(duration)
+            if not self.caches_partial_movies() or stop_condition is not None:
+                result = super().wait(duration, stop_condition, **kwargs)
+            else:
+                segment_key = self.get_segment_key('wait', duration)
+                result = self.play_segment(segment_key, super().wait, duration, **kwargs)
+            self.record_boundary()
+            return result
+
+    def get_static_layer(self, animations):
+        if not self.use_static_layers or self.skip_animations or self.window is not None:
+            return None
+        movers = {id(mobject) for animation in animations for mobject in animation.mobject.get_family()}
+        frame = self.camera.frame
+        if id(frame) in movers or frame.get_family_updaters():
+            return None
+        # only mobjects drawn before everything that moves can go under it,
+        # later ones would change the order things are drawn in
+        static_mobjects = []
+        for mobject in self.mobjects:
+            family = mobject.get_family()
+            if any(id(member) in movers or member.depth_test for member in family) or mobject.get_family_updaters():
+                break
+            static_mobjects.append(mobject)
+        if not static_mobjects:
+            return None
+        return StaticLayer(self.camera, static_mobjects, self.cull_mobjects)
+
+    def progress_through_animations(self, animations):
+        self.static_layer = self.get_static_layer(animations)
+        try:
+            self.progress_through_baked_animations(animations)
+        finally:
+            if self.static_layer is not None:
+                self.static_layer.release()
+                self.static_layer = None
+
+    def progress_through_baked_animations(self, animations):
+        if self.profiler is None and not self.bake_animations:
+            return super().progress_through_animations(animations)
+        track = None
+        if self.bake_animations and not self.skip_animations:
+            with profile_span('bake', 'interpolate'):
+                track = AnimationTrack(animations)
+        last_t = 0
+        for t in self.get_animation_time_progression(animations):
+            dt = t - last_t
+            last_t = t
+            with profile_span('interpolate'):
+                for animation in animations:
+                    animation.update_mobjects(dt)
+                    if track is None:
+                        animation.interpolate(t / animation.run_time)
+                if track is not None:
+                    track.interpolate(t)
+            self.update_frame(dt)
+            self.emit_frame()
+
+    def emit_frame(self):
+        if not self.skip_animations:
+            self.frames_emitted += 1
+        super().emit_frame()
+
+    def tear_down(self):
+        if self.play_timeline is not None:
+            self.play_timeline.save()
+        if self.profiler is None:
+            return super().tear_down()
+        self.profiler.add_span('construct', 'construct', self.last_call_end, time.perf_counter())
+        with self.profiler.span('finish'):
+            super().tear_down()
+        log.info(f'Render profile ready at {self.profiler.write(self.profile_directory)}')
+        profiler.PROFILER = None
+
+    def update_frame(self, dt=0, ignore_skipping=False):
+        if self.window or (self.skip_animations and not ignore_skipping):
+            self.last_frame_key = None
+            self.frame_changed = True
+            return super().update_frame(dt, ignore_skipping)
+        self.increment_time(dt)
+        self.update_mobjects(dt)
+        # waits and holds leave every mobject untouched, those frames are
+        # rasterized once and reused
+        frame_key = self.get_frame_key()
+        self.frame_changed = frame_key != self.last_frame_key
+        if self.frame_changed:
+            self.last_frame_key = frame_key
+            with profile_span('capture', 'rasterize'):
+                self.camera.clear()
+                mobjects = self.mobjects
+                static_layer = self.static_layer
+                if static_layer is not None and mobjects[:len(static_layer.mobjects)] == static_layer.mobjects:
+                    static_layer.draw()
+                    mobjects = mobjects[len(static_layer.mobjects):]
+                if self.cull_mobjects:
+                    capture_visible(self.camera, mobjects)
+                else:
+                    self.camera.capture(*mobjects)
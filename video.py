@@ -1,17 +1,50 @@
-import math
+import itertools
+import os
+import sys
 from manimlib import *
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import tex_cache
+from binomials import BINOMIAL_ROWS, binomial, row_sum
+from numerals import numeral, share_geometry
+from profiler import profiled
+from triangle_scene import TriangleScene
+
+tex_cache.install()
+
 ACCENT_COLOR = '#66cb51'
 SECONDARY_COLOR = '#be2540'
 TERTIARY_COLOR = '#ffffff'
 
+def triangle_layout(cell_sizes, row_lengths, spacing=2, buff=MED_SMALL_BUFF):
+    # centers of every cell in one pass, same arrangement as moving each cell
+    # spacing to the right of the previous one and putting each row next_to
+    # the one above it: rows are centered on x = 0 and row 0 on y = 0
+    row_lengths = np.asarray(row_lengths)
+    row_starts = np.cumsum(row_lengths) - row_lengths
+    rows = np.repeat(np.arange(len(row_lengths)), row_lengths)
+    cols = np.arange(len(rows)) - row_starts[rows]
+    half_widths = cell_sizes[:, 0] / 2
+    half_heights = cell_sizes[:, 1] / 2
+    x = spacing * cols.astype(float)
+    row_lefts = np.minimum.reduceat(x - half_widths, row_starts)
+    row_rights = np.maximum.reduceat(x + half_widths, row_starts)
+    x -= ((row_lefts + row_rights) / 2)[rows]
+    row_half_heights = np.maximum.reduceat(half_heights, row_starts)
+    row_y = -np.concatenate([[0], np.cumsum(row_half_heights[:-1] + buff + row_half_heights[1:])])
+    centers = np.zeros((len(rows), 3))
+    centers[:, 0] = x
+    centers[:, 1] = row_y[rows]
+    return centers
+
 class PascalTriangle:
-    def __init__(self, number_scale=2):
+    def __init__(self, number_scale=2, collumn_spacing=2):
         self.group = VGroup()
         self.number_scale = number_scale
+        self.collumn_spacing = collumn_spacing
     
     def calculate_collumn(self, row, col):
-        return int(math.factorial(row)/(math.factorial(col)*math.factorial(row-col)))
+        return BINOMIAL_ROWS.row(row)[col]
 
     def focus_on(self, row):
         self.focused_on = self.group.submobjects[row]
@@ -24,53 +57,212 @@ class PascalTriangle:
         self.original_focused_on = None
         return animations
 
+    def create_row(self, row):
+        row_group = VGroup()
+        for collumn_value in BINOMIAL_ROWS.row(row):
+            collumn = numeral(collumn_value, ACCENT_COLOR, self.number_scale)
+            row_group.add(collumn)
+        return row_group
+
+    def place_rows(self, rows, top_center=None):
+        # without a top_center the rows are centered on the origin
+        collumns = [collumn for row in rows for collumn in row.submobjects]
+        centers = np.array([collumn.get_center() for collumn in collumns])
+        sizes = np.array([(collumn.get_width(), collumn.get_height()) for collumn in collumns])
+        targets = triangle_layout(sizes, [len(row.submobjects) for row in rows], self.collumn_spacing)
+        lows = targets[:, :2] - sizes / 2
+        highs = targets[:, :2] + sizes / 2
+        if top_center is None:
+            targets[:, :2] -= (lows.min(0) + highs.max(0)) / 2
+        else:
+            targets[:, 0] += top_center[0] - (lows[:, 0].min() + highs[:, 0].max()) / 2
+            targets[:, 1] += top_center[1] - highs[:, 1].max()
+        for collumn, offset in zip(collumns, targets - centers):
+            collumn.shift(offset)
+
+    @profiled('mobjects')
     def generate_next_row(self):
         current_row = len(self.group.submobjects) - 1
         next_row = current_row + 1
-        next_row_group = VGroup()
-        for col in range(next_row + 1):
-            collumn_value = self.calculate_collumn(next_row, col)
-            collumn = Tex(str(collumn_value))
-            collumn.set_color(ACCENT_COLOR)
-            collumn.scale(self.number_scale)
-            if col > 0:
-                collumn.move_to(next_row_group[col - 1]).shift(RIGHT * 2)
-            next_row_group.add(collumn)
+        next_row_group = self.create_row(next_row)
         if current_row == -1:
-            next_row_group.move_to(ORIGIN)
+            self.place_rows([next_row_group])
         else:
             current_row_group = self.group[current_row]
-            next_row_group.next_to(current_row_group, DOWN)
+            self.place_rows([next_row_group], current_row_group.get_bottom() + DOWN * MED_SMALL_BUFF)
         self.group.add(next_row_group)
     
+    @profiled('mobjects')
     def generate(self, up_to):
-        self.group = VGroup()
-        for _ in range(up_to + 1):
-            self.generate_next_row()
+        BINOMIAL_ROWS.row(up_to)
+        self.group = VGroup(*(self.create_row(row) for row in range(up_to + 1)))
+        self.place_rows(self.group.submobjects)
+
+def triangular_number(n):
+    return n * (n + 1) // 2
+
+class LargePascalTriangle:
+    # hundreds to thousands of rows: the values mod modulus live in one flat
+    # array, row r starting at triangular_number(r), and the whole triangle
+    # is a single DotCloud colored by whether the value is divisible
+    def __init__(self, modulus=2, cell_size=0.05, dot_ratio=0.45):
+        self.modulus = modulus
+        self.cell_size = cell_size
+        self.dot_radius = dot_ratio * cell_size
+        self.dtype = np.min_scalar_type(2 * (modulus - 1))
+        self.values = np.zeros(0, dtype=self.dtype)
+        self.row_count = 0
+        self.group = DotCloud(radius=self.dot_radius)
+        self.focused_on = None
+
+    def get_row_slice(self, row):
+        return slice(triangular_number(row), triangular_number(row + 1))
+
+    def calculate_collumn(self, row, col):
+        return int(self.values[triangular_number(row) + col])
+
+    def calculate_row(self, row):
+        next_row = np.ones(row + 1, dtype=self.dtype)
+        if row > 1:
+            last_row = self.values[self.get_row_slice(row - 1)]
+            next_row[1:-1] = (last_row[:-1] + last_row[1:]) % self.modulus
+        return next_row % self.modulus
+
+    def get_rgbas(self, values):
+        rgbas = np.empty((len(values), 4))
+        rgbas[:] = color_to_rgba(ACCENT_COLOR)
+        rgbas[values == 0] = color_to_rgba(SECONDARY_COLOR)
+        return rgbas
+
+    def get_cell_offsets(self, rows, cols):
+        offsets = np.zeros((len(rows), 3))
+        offsets[:, 0] = self.cell_size * (cols - rows / 2)
+        offsets[:, 1] = -self.cell_size * rows * np.sqrt(3) / 2
+        return offsets
+
+    def set_cells(self, points, radii):
+        self.group.set_points(points)
+        self.group.set_rgba_array(self.get_rgbas(self.values))
+        self.group.set_radii(radii)
+
+    @profiled('mobjects')
+    def generate(self, up_to):
+        self.row_count = up_to + 1
+        self.values = np.empty(triangular_number(self.row_count), dtype=self.dtype)
+        for row in range(self.row_count):
+            self.values[self.get_row_slice(row)] = self.calculate_row(row)
+        rows = np.repeat(np.arange(self.row_count), np.arange(1, self.row_count + 1))
+        cols = np.arange(len(rows)) - triangular_number(rows)
+        self.set_cells(self.get_cell_offsets(rows, cols), np.full(len(rows), self.dot_radius))
         self.group.move_to(ORIGIN)
 
+    @profiled('mobjects')
+    def generate_next_row(self):
+        next_row = self.row_count
+        points = self.group.get_points()
+        radii = self.group.get_radii()[:len(points), 0]
+        if next_row < 2:
+            next_row_points = self.get_cell_offsets(np.full(next_row + 1, next_row), np.arange(next_row + 1))
+            if next_row == 1:
+                next_row_points += points[0]
+        else:
+            # step down from the row above, so a moved or scaled triangle
+            # keeps growing in place
+            last_row_points = points[self.get_row_slice(next_row - 1)]
+            next_row_points = np.vstack([
+                last_row_points + points[1] - points[0],
+                last_row_points[-1:] + points[2] - points[0],
+            ])
+        next_row_radius = radii[-1] if next_row > 0 else self.dot_radius
+        self.values = np.concatenate([self.values, self.calculate_row(next_row)])
+        self.row_count += 1
+        self.set_cells(
+            np.vstack([points, next_row_points]),
+            np.concatenate([radii, np.full(next_row + 1, next_row_radius)]),
+        )
+
+    def grow_next_row(self):
+        # like GrowFromCenter on a new row of PascalTriangle, the dots of the
+        # new row grow from nothing
+        self.generate_next_row()
+        row_slice = self.get_row_slice(self.row_count - 1)
+        radii = self.group.get_radii()[row_slice].copy()
+        def grow(cloud, alpha):
+            cloud.get_radii()[row_slice] = alpha * radii
+            cloud.refresh_bounding_box()
+        grow(self.group, 0)
+        return UpdateFromAlphaFunc(self.group, grow)
+
+    def focus_on(self, row):
+        self.focused_on = row
+        self.original_focused_on = self.group.copy()
+        others = np.ones(len(self.values), dtype=bool)
+        others[self.get_row_slice(row)] = False
+        opacities = self.group.data['rgbas'][others, 3].copy()
+        def fade_others(cloud, alpha):
+            cloud.data['rgbas'][others, 3] = (1 - alpha) * opacities
+        return [UpdateFromAlphaFunc(self.group, fade_others)]
+
+    def unfocus(self):
+        animations = [Transform(self.group, self.original_focused_on)]
+        self.focused_on = None
+        self.original_focused_on = None
+        return animations
+
 # adapted code from itertools
-def find_choices(options, choices):
-    # find_choices(VGroup(A, B, C, D), 2) --> VGroup(VGroup(A, B), VGroup(A, C), VGroup(A, D), VGroup(B, C), VGroup(B, D), VGroup(C, D))
-    # where every choice is a copy of the original object
-    pool = options.submobjects
+def iter_choices(options, choices):
+    # iter_choices(VGroup(A, B, C, D), 2) --> VGroup(A, B), VGroup(A, C), VGroup(A, D), VGroup(B, C), VGroup(B, D), VGroup(C, D)
+    # every choice is only copied from the pool when it is asked for, and
+    # its copies share their arrays with the pool until they are changed
+    pool = [share_geometry(option.copy()) for option in options.submobjects]
     n = len(pool)
     if choices > n:
         return
     indices = list(range(choices))
-    combinations = VGroup(VGroup(*(pool[i].copy() for i in indices)))
+    yield VGroup(*(pool[i].copy() for i in indices))
     while True:
         for i in reversed(range(choices)):
             if indices[i] != i + n - choices:
                 break
         else:
-            return combinations
+            return
         indices[i] += 1
         for j in range(i+1, choices):
             indices[j] = indices[j-1] + 1
-        combinations.add(VGroup(*(pool[i].copy() for i in indices)))
+        yield VGroup(*(pool[i].copy() for i in indices))
+
+@profiled('mobjects')
+def find_choices(options, choices):
+    # find_choices(VGroup(A, B, C, D), 2) --> VGroup(VGroup(A, B), VGroup(A, C), VGroup(A, D), VGroup(B, C), VGroup(B, D), VGroup(C, D))
+    # where every choice is a copy of the original object
+    if choices > len(options.submobjects):
+        return
+    return VGroup(*iter_choices(options, choices))
+
+def layout_choice(choice):
+    for j, object in enumerate(choice.submobjects):
+        if j > 0:
+            last_object = choice.submobjects[j - 1]
+            object.next_to(last_object, RIGHT)
+        else:
+            object.move_to(ORIGIN)
+    return choice
+
+def iter_choice_chunks(options, choices, chunk_size=10):
+    # lays out chunk_size choices at a time, side by side, so big sets like
+    # C(10, 4) are shown chunk by chunk, only the chunk being laid out is
+    # held here and the first one is ready before the rest are built
+    remaining_choices = iter_choices(options, choices)
+    while True:
+        chunk = VGroup(*(layout_choice(choice) for choice in itertools.islice(remaining_choices, chunk_size)))
+        if len(chunk.submobjects) == 0:
+            return
+        for i, choice in enumerate(chunk.submobjects):
+            if i > 0:
+                choice.next_to(chunk.submobjects[i - 1], RIGHT)
+        yield chunk
 
-class Presentation(Scene):
+class Presentation(TriangleScene):
     def find_pairs_from_row(self, row):
         triangle_row = self.triangle.submobjects[row - 1]
         pairs = []
@@ -80,32 +272,35 @@ class Presentation(Scene):
                 pairs.append(VGroup(col, next_col))
         return pairs
 
-    def create_next_row(self, total_run_time=1):
+    def create_next_row(self, total_run_time=1, batched=True):
         current_row = len(self.triangle.submobjects)
         next_row = current_row + 1
         next_row_index = next_row - 1
         above_pairs = self.find_pairs_from_row(current_row)
+        row_values = BINOMIAL_ROWS.row(next_row)
         next_row_group = VGroup()
+        collumn_transforms = []
         collumn_tex_scale = 2
         for col, pair in enumerate(above_pairs):
-            collumn_value = int(math.factorial(next_row)/(math.factorial(col + 1)*math.factorial(next_row - col - 1)))
-            collumn = Tex(str(collumn_value))
-            collumn.set_color(ACCENT_COLOR)
-            collumn.scale(collumn_tex_scale)
+            collumn_value = row_values[col + 1]
+            collumn = numeral(collumn_value, ACCENT_COLOR, collumn_tex_scale)
             if col > 0:
                 collumn.move_to(next_row_group[col - 1]).shift(RIGHT * 2)
             else:
                 collumn.next_to(pair, DOWN)
             next_row_group.add(collumn)
-            self.play(TransformFromCopy(pair, collumn), run_time = total_run_time / (next_row_index+2))
-        first_one = Tex('1')
-        first_one.set_color(ACCENT_COLOR)
-        first_one.scale(collumn_tex_scale)
+            collumn_transforms.append(TransformFromCopy(pair, collumn))
+        collumn_run_time = total_run_time / (next_row_index+2)
+        if batched:
+            # one play for the whole row, each transform starting when the previous one ends
+            self.play(LaggedStart(*collumn_transforms, lag_ratio=1), run_time = collumn_run_time * len(collumn_transforms))
+        else:
+            for collumn_transform in collumn_transforms:
+                self.play(collumn_transform, run_time = collumn_run_time)
+        first_one = numeral(1, ACCENT_COLOR, collumn_tex_scale)
         first_one.move_to(next_row_group.submobjects[0])
         first_one.shift(LEFT * 2)
-        second_one = Tex('1')
-        second_one.set_color(ACCENT_COLOR)
-        second_one.scale(collumn_tex_scale)
+        second_one = numeral(1, ACCENT_COLOR, collumn_tex_scale)
         last_col = next_row_group.submobjects[len(next_row_group.submobjects) - 1]
         second_one.move_to(last_col)
         second_one.shift(RIGHT * 2)
@@ -115,7 +310,7 @@ class Presentation(Scene):
         self.triangle.add(next_row_group)
 
     def construct(self):
-        one = Tex('1').set_color(ACCENT_COLOR).scale(2)
+        one = numeral(1, ACCENT_COLOR, 2)
         self.play(Write(one))
         self.wait()
         second_one = one.copy()
@@ -135,7 +330,7 @@ class Presentation(Scene):
         self.create_next_row()
         self.play(self.triangle.animate.to_edge(UP))
 
-class NChooseK(Scene):
+class NChooseK(TriangleScene):
     def construct(self):
         self.ptriangle = PascalTriangle()
         self.ptriangle.generate(4)
@@ -163,7 +358,7 @@ class NChooseK(Scene):
         self.choose_1.move_to(ORIGIN)
         self.choose_1.space_out_submobjects(1.5)
         self.choose_1_arrow = Arrow(self.choose_1.get_edge_center(RIGHT), self.choose_1.get_edge_center(RIGHT) + RIGHT * 2).set_color(TERTIARY_COLOR).to_edge(RIGHT).shift(LEFT/2)
-        self.choose_1_result = Tex('3').set_color(ACCENT_COLOR).scale(2).next_to(self.choose_1_arrow, RIGHT)
+        self.choose_1_result = numeral(binomial(3, 1), ACCENT_COLOR, 2).next_to(self.choose_1_arrow, RIGHT)
 
         self.play(TransformFromCopy(self.object_choose_group, self.choose_1), FadeIn(self.choose_1_arrow), TransformFromCopy(self.ptriangle.focused_on.submobjects[1], self.choose_1_result), run_time=1.5)
 
@@ -181,7 +376,7 @@ class NChooseK(Scene):
         self.choose_2.move_to(ORIGIN)
         self.choose_2.shift(DOWN * 1.5)
         self.choose_2_arrow = Arrow(self.choose_2.get_edge_center(RIGHT), self.choose_2.get_edge_center(RIGHT) + RIGHT * 2).set_color(TERTIARY_COLOR).to_edge(RIGHT).shift(LEFT/2)
-        self.choose_2_result = Tex('3').set_color(ACCENT_COLOR).scale(2).next_to(self.choose_2_arrow, RIGHT)
+        self.choose_2_result = numeral(binomial(3, 2), ACCENT_COLOR, 2).next_to(self.choose_2_arrow, RIGHT)
 
         self.play(TransformFromCopy(self.object_choose_group, self.choose_2), FadeIn(self.choose_2_arrow), TransformFromCopy(self.ptriangle.focused_on.submobjects[2], self.choose_2_result), run_time=3)
 
@@ -191,7 +386,7 @@ class NChooseK(Scene):
         self.choose_3.move_to(ORIGIN)
         self.choose_3.shift(DOWN * 3)
         self.choose_3_arrow = Arrow(self.choose_3.get_edge_center(RIGHT), self.choose_3.get_edge_center(RIGHT) + RIGHT * 2).set_color(TERTIARY_COLOR).to_edge(RIGHT).shift(LEFT/2)
-        self.choose_3_result = Tex('1').set_color(ACCENT_COLOR).scale(2).next_to(self.choose_3_arrow, RIGHT)
+        self.choose_3_result = numeral(binomial(3, 3), ACCENT_COLOR, 2).next_to(self.choose_3_arrow, RIGHT)
 
         self.play(TransformFromCopy(self.object_choose_group, self.choose_3), FadeIn(self.choose_3_arrow), TransformFromCopy(self.ptriangle.focused_on.submobjects[3], self.choose_3_result), run_time=3)
 
@@ -206,7 +401,7 @@ class NChooseK(Scene):
 
         self.play(*self.ptriangle.unfocus(), FadeOut(self.choose_1), FadeOut(self.choose_2), FadeOut(self.choose_3), FadeOut(self.choose_1_arrow), FadeOut(self.choose_2_arrow), FadeOut(self.choose_3_arrow), FadeOut(self.choose_1_result), FadeOut(self.choose_2_result), FadeOut(self.choose_3_result), FadeOut(self.separator_line), FadeOut(self.object_choose_group))
 
-class NChooseKRelationProof(Scene):
+class NChooseKRelationProof(TriangleScene):
     def construct(self):
         self.ptriangle = PascalTriangle()
         self.ptriangle.generate(4)
@@ -233,12 +428,7 @@ class NChooseKRelationProof(Scene):
 
         self.choose_2 = find_choices(self.objects_to_choose, 2)
         for i, choice in enumerate(self.choose_2.submobjects):
-            for j, object in enumerate(choice.submobjects):
-                if j > 0:
-                    last_object = choice.submobjects[j - 1]
-                    object.next_to(last_object, RIGHT)
-                else:
-                    object.move_to(ORIGIN)
+            layout_choice(choice)
             if i > 0:
                 last_choice = self.choose_2.submobjects[i - 1]
                 choice.next_to(last_choice, RIGHT)
@@ -340,12 +530,7 @@ class NChooseKRelationProof(Scene):
         self.play(self.objects_to_choose.animate.shift(LEFT))
         self.choose_2_other = find_choices(self.objects_to_choose, 2)
         for i, choice in enumerate(self.choose_2_other.submobjects):
-            for j, object in enumerate(choice.submobjects):
-                if j > 0:
-                    last_object = choice.submobjects[j - 1]
-                    object.next_to(last_object, RIGHT)
-                else:
-                    object.move_to(ORIGIN)
+            layout_choice(choice)
             if i > 0:
                 last_choice = self.choose_2_other.submobjects[i - 1]
                 choice.next_to(last_choice, RIGHT)
@@ -416,7 +601,7 @@ class NChooseKRelationProof(Scene):
 
         self.play(FadeOut(self.objects_to_choose), FadeOut(self.choose_2_other))
 
-class RowSums(Scene):
+class RowSums(TriangleScene):
     def construct(self):
         self.ptriangle = PascalTriangle()
         self.ptriangle.generate(5)
@@ -433,7 +618,7 @@ class RowSums(Scene):
             if i > 0:
                 self.play(row.animate.to_edge(LEFT))
                 result_arrow = Arrow(row.get_edge_center(RIGHT), row.get_edge_center(RIGHT) + RIGHT * 2).set_color(TERTIARY_COLOR)
-                result = Tex(str(2**i)).set_color(SECONDARY_COLOR).next_to(result_arrow, RIGHT).scale(1.5)
+                result = numeral(row_sum(i)).set_color(SECONDARY_COLOR).next_to(result_arrow, RIGHT).scale(1.5)
                 power_2 = VGroup(result_arrow, result)
                 power_2_s.add(power_2)
                 power_2.to_edge(RIGHT)
@@ -469,7 +654,7 @@ class RowSums(Scene):
         
         self.play(*(FadeOut(obj) for obj in self.mobjects))
 
-class Ending(Scene):
+class Ending(TriangleScene):
     def find_pairs_from_row(self, row):
         triangle_row = self.triangle.submobjects[row - 1]
         pairs = []
@@ -479,31 +664,34 @@ class Ending(Scene):
                 pairs.append(VGroup(col, next_col))
         return pairs
 
-    def create_next_row(self, total_run_time=1, scale=1):
+    def create_next_row(self, total_run_time=1, scale=1, batched=True):
         current_row = len(self.triangle.submobjects)
         next_row = current_row + 1
         next_row_index = next_row - 1
         above_pairs = self.find_pairs_from_row(current_row)
+        row_values = BINOMIAL_ROWS.row(next_row)
         next_row_group = VGroup()
+        collumn_transforms = []
         for col, pair in enumerate(above_pairs):
-            collumn_value = int(math.factorial(next_row)/(math.factorial(col + 1)*math.factorial(next_row - col - 1)))
-            collumn = Tex(str(collumn_value))
-            collumn.set_color(ACCENT_COLOR)
-            collumn.scale(2 * scale)
+            collumn_value = row_values[col + 1]
+            collumn = numeral(collumn_value, ACCENT_COLOR, 2 * scale)
             if col > 0:
                 collumn.move_to(next_row_group[col - 1]).shift(RIGHT * 2 * scale)
             else:
                 collumn.next_to(pair, DOWN)
             next_row_group.add(collumn)
-            self.play(TransformFromCopy(pair, collumn), run_time = total_run_time / (next_row_index+2))
-        first_one = Tex('1')
-        first_one.set_color(ACCENT_COLOR)
-        first_one.scale(2 * scale)
+            collumn_transforms.append(TransformFromCopy(pair, collumn))
+        collumn_run_time = total_run_time / (next_row_index+2)
+        if batched:
+            # one play for the whole row, each transform starting when the previous one ends
+            self.play(LaggedStart(*collumn_transforms, lag_ratio=1), run_time = collumn_run_time * len(collumn_transforms))
+        else:
+            for collumn_transform in collumn_transforms:
+                self.play(collumn_transform, run_time = collumn_run_time)
+        first_one = numeral(1, ACCENT_COLOR, 2 * scale)
         first_one.move_to(next_row_group.submobjects[0])
         first_one.shift(LEFT * 2 * scale)
-        second_one = Tex('1')
-        second_one.set_color(ACCENT_COLOR)
-        second_one.scale(2 * scale)
+        second_one = numeral(1, ACCENT_COLOR, 2 * scale)
         last_col = next_row_group.submobjects[len(next_row_group.submobjects) - 1]
         second_one.move_to(last_col)
         second_one.shift(RIGHT * 2 * scale)
@@ -513,7 +701,7 @@ class Ending(Scene):
         self.triangle.add(next_row_group)
 
     def construct(self):
-        one = Tex('1').set_color(ACCENT_COLOR).scale(2)
+        one = numeral(1, ACCENT_COLOR, 2)
         one.to_edge(UP)
         self.play(Write(one))
         self.wait()
@@ -553,7 +741,7 @@ class Ending(Scene):
         self.wait()
         self.create_next_row(0.35, 0.35)
 
-class Thumbnail(Scene):
+class Thumbnail(TriangleScene):
     def construct(self):
         self.triangle = PascalTriangle(3)
         self.triangle.generate(5)